@@ -1,7 +1,11 @@
 import re
+import sys
 
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import NamedTuple, Literal
+from time import time_ns
+from types import MethodType
+from typing import Callable, NamedTuple, Literal
 
 from filesweep.config.misc import human_size, human_time
 from filesweep.config.policy import Policy
@@ -16,6 +20,8 @@ class FileInfo(NamedTuple):
     device: int
     file_hash: str
     first_16b: str
+    name: str   # path.name, cached for pattern matching
+    suffix: str # path.suffix, cached for pattern matching
 
 class IncompleteFileInfo(NamedTuple):
     path: Path
@@ -27,6 +33,8 @@ class IncompleteFileInfo(NamedTuple):
     device: int
     file_hash: None
     first_16b: None
+    name: str   # path.name, cached for pattern matching
+    suffix: str # path.suffix, cached for pattern matching
 
     def complete(self, file_hash: str, first_16b: str) -> FileInfo:
         return FileInfo(
@@ -37,30 +45,71 @@ class IncompleteFileInfo(NamedTuple):
             created=self.created,
             inode=self.inode,
             device=self.device,
-            file_hash=file_hash,
-            first_16b=first_16b
+            # Interned, so that equal digests share one string in the database indexes
+            file_hash=sys.intern(file_hash),
+            first_16b=sys.intern(first_16b),
+            name=self.name,
+            suffix=self.suffix,
         )
 
 # Pattern matching classes for file filtering
 
-class NamePattern(NamedTuple):
+# NamePattern matchers, one per pattern type. The matcher is selected once when
+# the pattern is built, so match() does not branch on the type for every file.
+def _match_any(self: 'NamePattern', file: FileInfo | IncompleteFileInfo) -> bool:
+    return True
+
+def _match_none(self: 'NamePattern', file: FileInfo | IncompleteFileInfo) -> bool:
+    return False
+
+def _match_ext(self: 'NamePattern', file: FileInfo | IncompleteFileInfo) -> bool:
+    return file.suffix == self.pattern
+
+def _match_name(self: 'NamePattern', file: FileInfo | IncompleteFileInfo) -> bool:
+    return file.name == self.pattern
+
+def _match_regex(self: 'NamePattern', file: FileInfo | IncompleteFileInfo) -> bool:
+    return self.compiled.fullmatch(file.name) is not None # type: ignore
+
+@dataclass(slots=True, frozen=True)
+class NamePattern:
     pattern: str
     type: Literal["extension", "regex", "name"] # 'extension', 'regex', 'name'
+    # Regex patterns are compiled once on construction, not on every match.
+    compiled: re.Pattern[str] | None = field(default=None, init=False, repr=False, compare=False)
+    match: Callable[[FileInfo | IncompleteFileInfo], bool] = field(init=False, repr=False, compare=False)
+    _repr: str = field(init=False, repr=False, compare=False) # Cached __repr__, see _render()
 
-    def match(self, file: FileInfo | IncompleteFileInfo) -> bool:
+    def __post_init__(self) -> None:
+        object.__setattr__(self, 'pattern', sys.intern(self.pattern))
         match self.type:
             case 'extension':
-                if self.pattern == '.*':
-                    return True
-                return file.path.suffix == self.pattern
+                matcher = _match_any if self.pattern == '.*' else _match_ext
             case 'regex':
-                return re.fullmatch(self.pattern, file.path.name) is not None
+                object.__setattr__(self, 'compiled', re.compile(self.pattern))
+                matcher = _match_regex
             case 'name':
-                if self.pattern == '*':
-                    return True
-                return file.path.name == self.pattern
-        return False
+                matcher = _match_any if self.pattern == '*' else _match_name
+            case _:
+                matcher = _match_none
+        object.__setattr__(self, 'match', MethodType(matcher, self))
+        object.__setattr__(self, '_repr', self._render())
+
+    def bind(self, now_ns: int) -> 'NamePattern':
+        return self
+
+    def required_fields(self) -> frozenset[str]:
+        # FileInfo fields read by match()
+        if self.type == 'extension' and self.pattern != '.*':
+            return frozenset(('suffix',))
+        if self.type == 'regex' or (self.type == 'name' and self.pattern != '*'):
+            return frozenset(('name',))
+        return frozenset()
+
     def __repr__(self) -> str:
+        return self._repr
+
+    def _render(self) -> str:
         match self.type:
             case "extension":
                 return f"['.{self.pattern.lstrip('.')}']"
@@ -70,10 +119,40 @@ class NamePattern(NamedTuple):
                 return f"[/{self.pattern}/]"
         return f"[?{self.pattern}]"
 
-    
-class SizePattern(NamedTuple):
+@dataclass(slots=True, frozen=True)
+class UnionNamePattern:
+    # Several name patterns OR'd together, matched with a single alternation regex.
+    compiled: re.Pattern[str]
+    patterns: tuple[NamePattern, ...]
+    _repr: str = field(init=False, repr=False, compare=False) # Cached __repr__, see _render()
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, '_repr', self._render())
+
+    def match(self, file: FileInfo | IncompleteFileInfo) -> bool:
+        return self.compiled.fullmatch(file.name) is not None
+
+    def bind(self, now_ns: int) -> 'UnionNamePattern':
+        return self
+
+    def required_fields(self) -> frozenset[str]:
+        return frozenset(('name',))
+
+    def __repr__(self) -> str:
+        return self._repr
+
+    def _render(self) -> str:
+        # Parenthesized like the Pattern it replaces, so the repr parses back to the same pattern
+        return f"({'|'.join(f'{p!r}' for p in self.patterns)})"
+
+@dataclass(slots=True, frozen=True)
+class SizePattern:
     min_size: int | None
     max_size: int | None
+    _repr: str = field(init=False, repr=False, compare=False) # Cached __repr__, see _render()
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, '_repr', self._render())
 
     def match(self, file: FileInfo | IncompleteFileInfo) -> bool:
         if self.min_size is not None and file.size < self.min_size:
@@ -81,60 +160,97 @@ class SizePattern(NamedTuple):
         if self.max_size is not None and file.size > self.max_size:
             return False
         return True
+
+    def bind(self, now_ns: int) -> 'SizePattern':
+        return self
+
+    def required_fields(self) -> frozenset[str]:
+        return frozenset(('size',))
     
     def __repr__(self) -> str:
+        return self._repr
+
+    def _render(self) -> str:
         m = human_size(self.min_size) if self.min_size is not None else ''
         M = human_size(self.max_size) if self.max_size is not None else ''
         return f"[{m}..{M}]"
     
 
 SECONDS_IN_DAY = 86400
-class DatePattern(NamedTuple):
+@dataclass(slots=True, frozen=True)
+class DatePattern:
     min: int | None
     max: int | None
     type: str  # 'modified', 'accessed', 'created'
+    now: int | None = None # Reference time in ns, set by bind(). Uses the current time if None.
+    _repr: str = field(init=False, repr=False, compare=False) # Cached __repr__, see _render()
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, '_repr', self._render())
     
     def match(self, file: FileInfo | IncompleteFileInfo) -> bool:
-        from time import time_ns
-        current_time = time_ns()
-        modified_time = current_time - file.modified
+        current_time = self.now if self.now is not None else time_ns()
+        file_time = current_time - getattr(file, self.type)
         if self.min is not None:
-            if modified_time < self.min:
+            if file_time < self.min:
                 return False
         if self.max is not None:
-            if modified_time > self.max:
+            if file_time > self.max:
                 return False
         return True
+
+    def bind(self, now_ns: int) -> 'DatePattern':
+        # Fix the reference time, so that the clock is read once per scan instead of once per file.
+        return replace(self, now=now_ns)
+
+    def required_fields(self) -> frozenset[str]:
+        return frozenset((self.type,))
     
     def __repr__(self) -> str:
+        return self._repr
+
+    def _render(self) -> str:
         m = human_time(int(round(self.min/1e9))) if self.min is not None else ''
         M = human_time(int(round(self.max/1e9))) if self.max is not None else ''
         return f"[{m}..{M}]"
 
-class Pattern(NamedTuple):
+@dataclass(slots=True, frozen=True)
+class Pattern:
     patterns: tuple['AnyPattern', ...]
     inverted: bool
     mergemode: Literal["all", "any"]  # any for include, all for exclude
+    _repr: str = field(init=False, repr=False, compare=False) # Cached __repr__, see _render()
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, '_repr', self._render())
 
     def match(self, file: FileInfo | IncompleteFileInfo) -> bool:
-        match self.inverted, self.mergemode:
-            case False, 'all':
-                return all(p.match(file) for p in self.patterns)
-            case False, 'any':
-                return any(p.match(file) for p in self.patterns)
-            case True, 'all':
-                return not all(p.match(file) for p in self.patterns)
-            case True, 'any':
-                return not any(p.match(file) for p in self.patterns)
-        return False
+        # Plain if/else instead of a match statement: this runs for every file.
+        if self.mergemode == 'all':
+            result = all(p.match(file) for p in self.patterns)
+        elif self.mergemode == 'any':
+            result = any(p.match(file) for p in self.patterns)
+        else:
+            return False
+        return not result if self.inverted else result
+
+    def bind(self, now_ns: int) -> 'Pattern':
+        return replace(self, patterns=tuple(p.bind(now_ns) for p in self.patterns))
+
+    def required_fields(self) -> frozenset[str]:
+        return frozenset().union(*(p.required_fields() for p in self.patterns))
     
     def __repr__(self) -> str:
+        return self._repr
+
+    def _render(self) -> str:
+        # Children are already constructed, so their reprs are cached
         m = "&" if self.mergemode == "all" else "|"
         inv = "!" if self.inverted else ""
         return f"{inv}({m.join(f"{p!r}" for p in self.patterns)})"
 
 
-AnyPattern = Pattern | NamePattern | DatePattern | SizePattern
+AnyPattern = Pattern | NamePattern | UnionNamePattern | DatePattern | SizePattern
 
 class DirectoryConfig(NamedTuple):
     path: Path
@@ -143,7 +259,7 @@ class DirectoryConfig(NamedTuple):
     policy: Policy
     rename: bool
     pattern: AnyPattern | None
-    skip_subdirs: tuple[str,...]
+    skip_subdirs: frozenset[str]
     hidden: bool
 
 class LoggingConfig(NamedTuple):
@@ -169,3 +285,10 @@ class Config(NamedTuple):
     logging: LoggingConfig | None
     performance: PerformanceConfig
     general: GeneralConfig
+
+    def bind(self, now_ns: int) -> 'Config':
+        # Returns the config with all patterns bound to the given reference time.
+        return self._replace(
+            dirs=[d._replace(pattern=d.pattern.bind(now_ns)) if d.pattern is not None else d for d in self.dirs],
+            pattern=self.pattern.bind(now_ns),
+        )
@@ -1,28 +1,35 @@
 import re
+import sys
 import yaml
 
+from dataclasses import replace
+from os import DirEntry
 from pathlib import Path
-from typing import Any, TypeVar, Sequence
+from typing import Any, Sequence
 
-from filesweep.config.classes import Config, AnyPattern, Pattern, NamePattern, SizePattern, DatePattern, DirectoryConfig, LoggingConfig, PerformanceConfig, GeneralConfig, IncompleteFileInfo
+from filesweep.config.classes import Config, AnyPattern, Pattern, NamePattern, UnionNamePattern, SizePattern, DatePattern, DirectoryConfig, LoggingConfig, PerformanceConfig, GeneralConfig, IncompleteFileInfo
 from filesweep.config.misc import parse_time, parse_size, SIZE_RE_STR, TIME_RE_STR
 from filesweep.config.policy import Policy
 
-_K = TypeVar('_K')
-_V = TypeVar('_V')
-def items(d: dict[_K, _V] | Sequence[tuple[_K, _V]] | tuple[_K, _V], /) -> Sequence[tuple[_K, _V]]:
-    if isinstance(d, dict):
-        return list(d.items())
-    if isinstance(d, tuple) and len(d) == 2:
-        return [d] # type: ignore
-    return d
+# Prefer the LibYAML-based loader, bundled with most PyYAML wheels
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+EXTENSION_STR_RE = re.compile(r"^'(\..*)'$")
+REGEX_STR_RE = re.compile(r"^/(.*)/$")
+NAME_STR_RE = re.compile(r"^'(.*)'$")
+SIZE_RANGE_RE = re.compile(f"^(?P<l>{SIZE_RE_STR})?..(?P<h>{SIZE_RE_STR})?$")
+TIME_RANGE_RE = re.compile(f"^(?P<l>{TIME_RE_STR})?..(?P<h>{TIME_RE_STR})?$")
+PATTERN_TOKEN_RE = re.compile(r"\[[^\]]*\]|[()&|]")
 
 def _load_config(config_path: str|Path) -> dict[str, Any]:
     with open(config_path, 'r') as file:
-        return yaml.safe_load(file)
+        return yaml.load(file, Loader=_YamlLoader)
 
 
-def _load_pattern(pattern_cfg: dict[str, Any]) -> AnyPattern:
+def _load_pattern(pattern_cfg: dict[str, Any] | tuple[str, Any]) -> AnyPattern:
     # Recursively load patterns
     # Get include/exclude
     patterns: list[AnyPattern] = []
@@ -37,14 +44,17 @@ def _load_pattern(pattern_cfg: dict[str, Any]) -> AnyPattern:
             raise ValueError(f"Invalid pattern string: {pattern_str}")
         return ptn
 
-    for action in items(pattern_cfg):
+    # Nested calls receive a single (action, config) item of the parent dict.
+    actions = pattern_cfg.items() if isinstance(pattern_cfg, dict) else (pattern_cfg,)
+
+    for action in actions:
         match action:
             case ['include', action_cfg]:
-                ptns = [_load_pattern(ptn_cfg) for ptn_cfg in action_cfg.items()]
-                patterns.append(Pattern(tuple(ptns), inverted=False, mergemode='all'))
+                ptns = tuple(_load_pattern(ptn_cfg) for ptn_cfg in action_cfg.items())
+                patterns.append(Pattern(ptns, inverted=False, mergemode='all'))
             case ['exclude', action_cfg]:
-                ptns = [_load_pattern(ptn_cfg) for ptn_cfg in action_cfg.items()]
-                patterns.append(Pattern(tuple(ptns), inverted=True, mergemode='any'))
+                ptns = tuple(_load_pattern(ptn_cfg) for ptn_cfg in action_cfg.items())
+                patterns.append(Pattern(ptns, inverted=True, mergemode='any'))
             case ['name', [*names]]:
                 mergemode = 'any'
 
@@ -72,6 +82,123 @@ def _load_pattern(pattern_cfg: dict[str, Any]) -> AnyPattern:
             
     return Pattern(tuple(patterns), inverted, mergemode)
 
+def _flatten_pattern(pattern: AnyPattern) -> AnyPattern:
+    # Recursively remove redundant nesting from the pattern tree:
+    #  - non-inverted children with the same mergemode are merged into the parent
+    #  - a single-child pattern is replaced by its child (or the child is inverted)
+    if not isinstance(pattern, Pattern):
+        return pattern
+    patterns: list[AnyPattern] = []
+    for p in pattern.patterns:
+        p = _flatten_pattern(p)
+        if isinstance(p, Pattern) and not p.inverted and p.mergemode == pattern.mergemode:
+            patterns.extend(p.patterns)
+        else:
+            patterns.append(p)
+
+    if len(patterns) == 1:
+        child = patterns[0]
+        if not pattern.inverted:
+            return child
+        if isinstance(child, Pattern) and not child.inverted:
+            return replace(child, inverted=True)
+    return replace(pattern, patterns=tuple(patterns))
+
+def _is_mergeable(ptn: NamePattern) -> bool:
+    # Whether the name pattern can be expressed as part of a union regex.
+    match ptn.type:
+        case 'extension':
+            # Path.suffix is the last dot-separated part, so extensions with
+            # inner dots never match and are left as they are.
+            return ptn.pattern == '.*' or (len(ptn.pattern) > 1 and '.' not in ptn.pattern[1:])
+        case 'name':
+            return True
+        case 'regex':
+            # Groups would be renumbered and global flags cannot be nested.
+            return ptn.compiled is not None and not ptn.compiled.groups and ptn.compiled.flags == re.UNICODE
+    return False
+
+def _union_regex(ptns: Sequence[NamePattern]) -> str:
+    # Builds a regex matching the full file name if any of the patterns match.
+    # All extensions share a single '.+\.(?:ext|...)' branch and all names a
+    # single literal branch, so the number of branches does not grow with the
+    # number of literals. Literals are sorted longest first.
+    if any(p.pattern in ('.*', '*') and p.type != 'regex' for p in ptns):
+        return r'(?s:.*)'
+    extensions = sorted({p.pattern[1:] for p in ptns if p.type == 'extension'}, key=len, reverse=True)
+    names = sorted({p.pattern for p in ptns if p.type == 'name'}, key=len, reverse=True)
+    regexes = [p.pattern for p in ptns if p.type == 'regex']
+
+    branches: list[str] = []
+    if extensions:
+        branches.append(r'(?s:.+)\.(?:' + '|'.join(map(re.escape, extensions)) + ')')
+    if names:
+        branches.append('(?:' + '|'.join(map(re.escape, names)) + ')')
+    branches.extend(f'(?:{r})' for r in regexes)
+    return '|'.join(branches)
+
+def _union_name_patterns(pattern: AnyPattern) -> AnyPattern:
+    # Recursively merge the name patterns of any-mode Patterns into a single
+    # UnionNamePattern, so that the file name is tested with one regex call.
+    if not isinstance(pattern, Pattern):
+        return pattern
+    patterns = [_union_name_patterns(p) for p in pattern.patterns]
+    if pattern.mergemode != 'any':
+        return replace(pattern, patterns=tuple(patterns))
+
+    mergeable = [p for p in patterns if isinstance(p, NamePattern) and _is_mergeable(p)]
+    if len(mergeable) < 2:
+        return replace(pattern, patterns=tuple(patterns))
+
+    try:
+        compiled = re.compile(_union_regex(mergeable))
+    except re.error:
+        return replace(pattern, patterns=tuple(patterns))
+
+    merged = {id(p) for p in mergeable}
+    union = UnionNamePattern(compiled, tuple(mergeable))
+    # The union takes the place of the first merged pattern.
+    idx = next(i for i, p in enumerate(patterns) if id(p) in merged)
+    patterns = [p for p in patterns if id(p) not in merged]
+    patterns.insert(idx, union)
+    if len(patterns) == 1 and not pattern.inverted:
+        return union
+    return replace(pattern, patterns=tuple(patterns))
+
+def _pattern_cost(pattern: AnyPattern) -> int:
+    # Rough relative cost of matching a single file against the pattern.
+    match pattern:
+        case SizePattern():
+            return 0
+        case DatePattern():
+            return 1
+        case NamePattern(pattern='.*' | '*', type='extension' | 'name'):
+            return 0
+        case NamePattern(type='extension' | 'name'):
+            return 2
+        case UnionNamePattern():
+            return 3
+        case NamePattern():
+            return 5
+        case Pattern():
+            return 4 + sum(_pattern_cost(p) for p in pattern.patterns)
+    return 5
+
+def _sort_by_cost(pattern: AnyPattern) -> AnyPattern:
+    # Recursively order the children of each Pattern from the cheapest to the
+    # most expensive, so that all() / any() short-circuit on cheap checks first.
+    if not isinstance(pattern, Pattern):
+        return pattern
+    patterns = sorted((_sort_by_cost(p) for p in pattern.patterns), key=_pattern_cost)
+    return replace(pattern, patterns=tuple(patterns))
+
+def _optimize_pattern(pattern: AnyPattern) -> AnyPattern:
+    # Rewrites a loaded pattern tree into an equivalent one that is faster to match.
+    pattern = _flatten_pattern(pattern)
+    pattern = _union_name_patterns(pattern)
+    pattern = _sort_by_cost(pattern)
+    return pattern
+
 def _read_path(path: str) -> Path:
     if path.startswith('~'):
         return Path(path).expanduser()
@@ -86,6 +213,8 @@ def load_config(config_path: str|Path) -> Config:
         _pattern = d.get('pattern', None)
         if _pattern is not None:
             _pattern = _parse_pattern_fromstr(_pattern)
+            if _pattern is not None:
+                _pattern = _optimize_pattern(_pattern)
         skip_subdirs_cfg = d.get('skip_subdirs', [])
 
         dir = DirectoryConfig(
@@ -95,7 +224,7 @@ def load_config(config_path: str|Path) -> Config:
                 Policy(d.get('policy', Policy.PROMPT)),
                 bool(d.get('rename', False)),
                 _pattern,
-                tuple(skip_subdirs_cfg),
+                frozenset(skip_subdirs_cfg),
                 bool(d.get('hidden', False)),
             )
         dirs.append(dir)
@@ -104,7 +233,7 @@ def load_config(config_path: str|Path) -> Config:
     if pattern_cfg is None:
         pattern = Pattern((), False, 'all') # All with no patterns returns True
     else:
-        pattern = _load_pattern(pattern_cfg)
+        pattern = _optimize_pattern(_load_pattern(pattern_cfg))
     
     logging_cfg = config_dict.get('logging', {})
     logging_pth = logging_cfg.get('file', None)
@@ -138,18 +267,33 @@ def load_config(config_path: str|Path) -> Config:
 
     return Config(dirs, pattern, logging, performance, general)
 
-def read_file_info(path: Path) -> IncompleteFileInfo:
-    stat = path.lstat()
+# FileInfo fields that can only be filled in by a stat call
+STAT_FIELDS = frozenset(('size', 'modified', 'accessed', 'created', 'inode', 'device'))
+
+def read_file_info(entry: Path | DirEntry[str], stat: bool = True) -> IncompleteFileInfo:
+    # If stat is False, the file is not stat'ed and only the path-derived
+    # fields are valid. Used to match patterns that do not need STAT_FIELDS.
+    path = entry if isinstance(entry, Path) else Path(entry.path)
+    if not stat:
+        return IncompleteFileInfo(path, 0, 0, 0, 0, 0, 0, None, None, entry.name, sys.intern(path.suffix))
+    if isinstance(entry, Path) or sys.platform == 'win32':
+        # On Windows, DirEntry.stat() reports st_ino and st_dev as 0
+        stat_result = path.lstat()
+    else:
+        stat_result = entry.stat(follow_symlinks=False)
     return IncompleteFileInfo(
         path=path,
-        size=stat.st_size,
-        modified=int(stat.st_mtime_ns),
-        accessed=int(stat.st_atime_ns),
-        created=int(stat.st_birthtime_ns),
-        inode=stat.st_ino,
-        device=stat.st_dev,
+        size=stat_result.st_size,
+        modified=int(stat_result.st_mtime_ns),
+        accessed=int(stat_result.st_atime_ns),
+        # Birth time is not available on every platform (e.g. Linux), fall back to ctime
+        created=int(getattr(stat_result, 'st_birthtime_ns', stat_result.st_ctime_ns)),
+        inode=stat_result.st_ino,
+        device=stat_result.st_dev,
         file_hash=None,
-        first_16b=None
+        first_16b=None,
+        name=entry.name,
+        suffix=sys.intern(path.suffix), # Few distinct values, shared across files
     )
 
 def _parse_pattern_fromstr(pattern_str: str) -> AnyPattern | None:
@@ -182,17 +326,17 @@ def _parse_pattern_fromstr(pattern_str: str) -> AnyPattern | None:
 
         if pattern_str == '..': # Ambiguous without context
             return None
-        elif (m:=re.match(r"^'(\..*)'$", pattern_str)): # Extension
+        elif (m:=EXTENSION_STR_RE.match(pattern_str)): # Extension
             return NamePattern(m.group(1), 'extension')
-        elif (m:=re.match(r"^/(.*)/$", pattern_str)): # Regex
+        elif (m:=REGEX_STR_RE.match(pattern_str)): # Regex
             return NamePattern(m.group(1), 'regex')
-        elif (m:=re.match(r"^'(.*)'$", pattern_str)): # Name
+        elif (m:=NAME_STR_RE.match(pattern_str)): # Name
             return NamePattern(m.group(1), 'name')
         
         # SizePattern
         # Number with unit, range defined by ..: 10KB.., ..10MB, 10KB..10MB
         # If minimum is bigger than maximum, return None
-        elif (m:=re.match(f"^(?P<l>{SIZE_RE_STR})?..(?P<h>{SIZE_RE_STR})?$", pattern_str.upper())):
+        elif (m:=SIZE_RANGE_RE.match(pattern_str.upper())):
             min_size_ = parse_size(m.group('l')) if m.group('l') != '' else None
             max_size_ = parse_size(m.group('h')) if m.group('h') != '' else None
             if min_size_ is not None and max_size_ is not None and min_size_ > max_size_:
@@ -202,7 +346,7 @@ def _parse_pattern_fromstr(pattern_str: str) -> AnyPattern | None:
         # DatePattern
         # Number with unit, range defined by ..: 0s.., 6m..10d.
         # If minimum is bigger than maximum, return None 
-        elif (m:=re.match(f"^(?P<l>{TIME_RE_STR})?..(?P<h>{TIME_RE_STR})?$", pattern_str)):
+        elif (m:=TIME_RANGE_RE.match(pattern_str)):
             min_time_ = parse_time(m.group('l')) if m.group('l') != '' else None
             max_time_ = parse_time(m.group('h')) if m.group('h') != '' else None
             if min_time_ is not None and max_time_ is not None and min_time_ > max_time_:
@@ -227,7 +371,10 @@ def _parse_pattern_fromstr(pattern_str: str) -> AnyPattern | None:
         mergemode = None # Default case. If only one pattern is present, it doesn't matter.
         depth = 0
         startidx = 0
-        for idx, chr in enumerate(pattern_str):
+        # Only parentheses and operators matter for splitting, [..] patterns are
+        # skipped as a whole so their contents are never read as operators.
+        for token in PATTERN_TOKEN_RE.finditer(pattern_str):
+            chr = token.group()
             if chr == '(':
                 depth += 1
             elif chr == ')':
@@ -235,6 +382,7 @@ def _parse_pattern_fromstr(pattern_str: str) -> AnyPattern | None:
             
             elif depth == 0 and chr in '&|':
                 # Split here
+                idx = token.start()
                 subpatterns_str.append(pattern_str[startidx:idx].strip())
                 startidx = idx + 1
                 if mergemode is None or mergemode == chr:
@@ -1,80 +1,131 @@
 import re
 
+# Used to find time and size ranges in pattern strings, see config.load
 TIME_RE_STR = r'(?:(\d+)y)?(?:(\d+)mo)?(?:(\d+)w)?(?:(\d+)d)?(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?'
-TIME_RE = re.compile(f'^{TIME_RE_STR}$', re.IGNORECASE)
-
 SIZE_RE_STR = r'(\d+(?:\.(?:\d+)?)?)([KMGTP]?)I?B?'
+
+# Reference grammar for parse_time and parse_size. The parsers below accept the
+# strings these match (parse_time also needs at least one unit), including the
+# single trailing newline that '$' allows, as left by YAML block scalars. Unlike
+# \d here, the parsers only accept ASCII digits. They are not built on the regexes:
+# a hand-written single pass is faster than a regex match.
+TIME_RE = re.compile(f'^{TIME_RE_STR}$', re.IGNORECASE)
 SIZE_RE = re.compile(f'^{SIZE_RE_STR}$', re.IGNORECASE)
 
+_DIGITS = '0123456789'
+
+# Time units in the order they must appear, and their length in seconds
+_TIME_UNITS = ('y', 'mo', 'w', 'd', 'h', 'm', 's')
+_TIME_SECONDS = (
+    31536000, # As 365 days
+    2592000,  # As 30 days
+    604800,   # As 7 days
+    86400,    # 24 hours
+    3600,     # 60 minutes
+    60,       # I mean, ...
+    1,        # Hope it is clear enough
+)
+
+# Size prefixes and their multipliers
+_SIZE_UNITS = 'KMGTP'
+_SIZE_MULT = (1024, 1048576, 1073741824, 1099511627776, 1125899906842624)
+
 def parse_time(string: str | int) -> int:
     # Parses duration strings like '1d2h3m4s' in rigid order (y,mo,w,d,h,m,s).
+    # Single pass over the string, equivalent to matching TIME_RE.
     if isinstance(string, int):
         return string
-    match = TIME_RE.match(string.lower())
-    if not match or not any(match.groups()):
+    s = string.lower()
+    if s.endswith('\n'):
+        s = s[:-1]
+    n = len(s)
+    i = 0
+    last = -1 # Index of the last parsed unit, units must be strictly increasing
+    total = 0
+    while i < n:
+        start = i
+        while i < n and s[i] in _DIGITS:
+            i += 1
+        if i == start or i == n:
+            raise ValueError("Invalid time format. Must be in order: y, w, d, h, m, s.")
+        unit = 'mo' if s.startswith('mo', i) else s[i]
+        try:
+            last = _TIME_UNITS.index(unit, last + 1)
+        except ValueError:
+            raise ValueError("Invalid time format. Must be in order: y, w, d, h, m, s.") from None
+        total += int(s[start:i]) * _TIME_SECONDS[last]
+        i += len(unit)
+    if last < 0:
         raise ValueError("Invalid time format. Must be in order: y, w, d, h, m, s.")
-    years, months, weeks, days, hours, minutes, seconds = (int(x) if x else 0 for x in match.groups())
-    return sum((
-        years * 31536000, # As 365 days
-        months * 2592000, # As 30 days
-        weeks * 604800,   # As 7 days
-        days * 86400,     # 24 hours
-        hours * 3600,     # 60 minutes
-        minutes * 60,     # I mean, ...
-        seconds           # Hope it is clear enough
-    )) * 1_000_000_000 # Convert to nanoseconds
+    return total * 1_000_000_000 # Convert to nanoseconds
 
 def parse_size(size_str: str | int) -> int:
     # Parses size strings like '10K', '20M', '1G', '500' (bytes if no suffix)
+    # Single pass over the string, equivalent to matching SIZE_RE.
     if isinstance(size_str, int):
         if size_str < 0:
             raise ValueError("Size must be non-negative.")
         return size_str
-    match = SIZE_RE.match(size_str.upper())
-    if not match:
+    s = size_str.upper()
+    if s.endswith('\n'):
+        s = s[:-1]
+    n = len(s)
+    i = 0
+    while i < n and s[i] in _DIGITS:
+        i += 1
+    if i == 0:
+        raise ValueError("Invalid size format. Must be a number optionally followed by a SI prefix k, M, G, T.")
+    if i < n and s[i] == '.':
+        i += 1
+        while i < n and s[i] in _DIGITS:
+            i += 1
+    size = float(s[:i])
+    multiplier = 1
+    if i < n and (unit := _SIZE_UNITS.find(s[i])) >= 0:
+        multiplier = _SIZE_MULT[unit]
+        i += 1
+    # Optional binary 'i' and byte 'B' markers, as in 10KiB
+    if i < n and s[i] == 'I':
+        i += 1
+    if i < n and s[i] == 'B':
+        i += 1
+    if i != n:
         raise ValueError("Invalid size format. Must be a number optionally followed by a SI prefix k, M, G, T.")
-    size, suffix = match.groups()
-    size = float(size)
-    multiplier = {
-        '': 1,
-        'K': 1024,
-        'M': 1048576,
-        'G': 1073741824,
-        'T': 1099511627776,
-        'P': 1125899906842624
-    }.get(suffix, 1)
     return int(size * multiplier)
 
+_HUMAN_SIZE_UNITS = ('B', 'kB', 'MB', 'GB', 'TB', 'PB', 'EB')
+
 def human_size(_size: int) -> str:
-    size = float(_size)
     # Converts a size in bytes to a human-readable string with appropriate SI suffix
-    if size < 0:
+    if _size < 0:
         raise ValueError("Size must be non-negative.")
-    for unit in ['B', 'kB', 'MB', 'GB', 'TB', 'PB']:
-        if size < 1024.0:
-            size_str = f"{size:.2f}"
-            size_str = size_str.rstrip('0').rstrip('.')
-            return f"{size_str}{unit}"
+    # Each unit is 2**10 times the previous one, so the unit follows from the bit length
+    unit = min(max(int(_size).bit_length() - 1, 0) // 10, len(_HUMAN_SIZE_UNITS) - 1)
+    size = _size / (1 << (unit * 10))
+    if size >= 1024.0 and unit < len(_HUMAN_SIZE_UNITS) - 1:
+        # Float rounding of very large sizes
+        unit += 1
         size /= 1024.0
     size_str = f"{size:.2f}"
     size_str = size_str.rstrip('0').rstrip('.')
-    return f"{size_str}EB"
+    return f"{size_str}{_HUMAN_SIZE_UNITS[unit]}"
+
+_HUMAN_TIME_INTERVALS = (
+    ('y', 31536000),
+    ('mo', 2592000),
+    ('w', 604800),
+    ('d', 86400),
+    ('h', 3600),
+    ('m', 60),
+    ('s', 1),
+)
 
 def human_time(seconds: int, max_chunks:int|None=None) -> str:
     # Converts a duration in seconds to a human-readable string
     if seconds < 0:
         raise ValueError("Time must be non-negative.")
-    intervals = (
-        ('y', 31536000),
-        ('mo', 2592000),
-        ('w', 604800),
-        ('d', 86400),
-        ('h', 3600),
-        ('m', 60),
-        ('s', 1),
-    )
     result:list[str] = []
-    for name, count in intervals:
+    for name, count in _HUMAN_TIME_INTERVALS:
         value, seconds = divmod(seconds, count)
         if max_chunks is not None and len(result)+1 >= max_chunks:
             # Last chunk, round the remaining value
@@ -83,4 +134,7 @@ def human_time(seconds: int, max_chunks:int|None=None) -> str:
             break
         if value:
             result.append(f"{value}{name}")
+        if not seconds and max_chunks is None:
+            # Nothing left to add
+            break
     return ''.join(result) if result else '0s'
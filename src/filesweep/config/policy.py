@@ -12,10 +12,12 @@ class Policy(Enum):
     ERASE = "erase!"
     NOACTION = "noaction"
 
+    _priority: int # Set below from _POLICY_PRIORITY
+
     def __lt__(self, other: object) -> bool:
         if not isinstance(other, Policy):
             return NotImplemented
-        return policy_priority(self) < policy_priority(other)
+        return self._priority < other._priority
 
 _POLICY_PRIORITY: dict[Policy, int] = {
     Policy.KEEP: 100,
@@ -28,11 +30,21 @@ _POLICY_PRIORITY: dict[Policy, int] = {
     Policy.NOACTION: 0
 }
 
+# Store the priority on each member, so that comparisons are a plain int compare.
+for _policy, _priority in _POLICY_PRIORITY.items():
+    _policy._priority = _priority
+del _policy, _priority
+
 def policy_priority(policy: str|Policy|int) -> int:
+    if isinstance(policy, Policy):
+        return policy._priority
     if isinstance(policy, str):
         if policy not in Policy._value2member_map_:
             raise ValueError(f"Unknown directory policy: {policy}")
-        policy = Policy(policy)
+        return Policy(policy)._priority
+    if isinstance(policy, bool):
+        # bool is a subclass of int, but never a valid priority
+        raise ValueError(f"Unknown directory policy priority: {policy}")
     if isinstance(policy, int):
         if policy not in _POLICY_PRIORITY.values():
             raise ValueError(f"Unknown directory policy priority: {policy}")
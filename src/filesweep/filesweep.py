@@ -1,17 +1,20 @@
 import logging
 import stat
+import sys
 
 from send2trash import send2trash
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from functools import total_ordering
-from os import utime, getenv
+from functools import total_ordering, lru_cache, partial
+from itertools import batched, chain
+from os import utime, getenv, scandir, DirEntry
 from pathlib import Path
-from queue import Queue, Empty
-from time import perf_counter
+from queue import SimpleQueue
+from time import perf_counter, time_ns
 from threading import Thread
-from typing import Iterable
+from typing import Callable, Iterable
 
 ## IMPORTANT:
 # As of now, hardlinks are not supported. The database treats paths as unique identifiers.
@@ -20,10 +23,10 @@ from typing import Iterable
 from filesweep import __version__
 from filesweep.config import load_config, Config, policy_priority, Policy, human_size
 from filesweep.config.classes import LoggingConfig, FileInfo, DirectoryConfig, IncompleteFileInfo
-from filesweep.config.load import read_file_info
+from filesweep.config.load import read_file_info, STAT_FIELDS
 from filesweep.hasher import hash_file, read_16b
 from filesweep.statdb import StatDB
-from filesweep.threadsafe import ThreadSafeIterator, ThreadSafeSet
+from filesweep.threadsafe import ThreadSafeIterator
 
 @total_ordering
 class Action(Enum):
@@ -140,33 +143,48 @@ def init(config_file: str|Path) -> tuple[Config, StatDB]:
 
     return config, db
 
-def _is_hidden(path: Path) -> bool:
-    if path.stat().st_file_attributes & stat.FILE_ATTRIBUTE_HIDDEN:
+def _is_hidden(entry: Path | DirEntry[str]) -> bool:
+    # The name check is free, so it runs first. The hidden attribute only
+    # exists on Windows (where scandir caches it), elsewhere no stat is done.
+    if entry.name.startswith('.'):
         return True
-    if path.name.startswith('.'):
+    if sys.platform == 'win32' and getattr(entry.stat(follow_symlinks=False), 'st_file_attributes', 0) & stat.FILE_ATTRIBUTE_HIDDEN:
         return True
     return False
 
-def _iterate_dir(directory: Path, current_depth: int, subdir_depth: int, dir_config: DirectoryConfig) -> Iterable[Path]:
-    for entry in directory.iterdir():
-        if entry.is_file():
-            if not dir_config.hidden and _is_hidden(entry):
-                continue
-            yield entry
-        else:
-            # TODO: check symlinks based on config
-            if entry.is_dir() and current_depth < subdir_depth:
-                if entry.name in dir_config.skip_subdirs:
-                    continue
-                if not dir_config.hidden and _is_hidden(entry):
-                    continue
-                yield from _iterate_dir(entry, current_depth + 1, subdir_depth, dir_config)
-
-def iterate_files(config: Config) -> Iterable[IncompleteFileInfo]:
+def _iterate_dir(directory: Path | str, subdir_depth: int, dir_config: DirectoryConfig, follow_symlinks: bool) -> Iterable[DirEntry[str]]:
+    # Uses scandir, so that file type checks reuse the directory listing
+    # instead of stat'ing every entry. Subdirectories are walked with an
+    # explicit stack, so only one directory handle is open at a time.
+    stack: list[tuple[str | Path, int]] = [(directory, 0)]
+    while stack:
+        current, current_depth = stack.pop()
+        subdirs: list[str] = []
+        with scandir(current) as entries:
+            for entry in entries:
+                # Symlinked files are always listed, as before. follow_symlinks only
+                # decides whether symlinked directories are descended into.
+                if entry.is_file():
+                    if not dir_config.hidden and _is_hidden(entry):
+                        continue
+                    yield entry
+                elif current_depth < subdir_depth and entry.is_dir(follow_symlinks=follow_symlinks):
+                    # Prune skipped and hidden subtrees before descending, cheapest check first
+                    if entry.name in dir_config.skip_subdirs:
+                        continue
+                    if not dir_config.hidden and _is_hidden(entry):
+                        continue
+                    subdirs.append(entry.path)
+        # Reversed, so that subdirectories are walked in listing order
+        stack.extend((subdir, current_depth + 1) for subdir in reversed(subdirs))
+
+def iterate_files(config: Config, with_stat: bool = True) -> Iterable[IncompleteFileInfo]:
     # Get an iterator over all files in the configured directories.
     # Respect include_subdirs and follow_symlinks settings.
     # Hash is not calculated here, f16b and hash are set to None.
+    # If with_stat is False, files are not stat'ed and only path fields are set.
     # Does not filter by pattern, size or date.
+    follow_symlinks = config.general.follow_symlinks
     for d in config.dirs:
         # Make subdirs into an integer: 0 -> False, True -> high value
         if d.include_subdirs is True:
@@ -176,31 +194,57 @@ def iterate_files(config: Config) -> Iterable[IncompleteFileInfo]:
         else:
             subdirs = d.include_subdirs
 
-        yield from (read_file_info(path) for path in _iterate_dir(d.path, 0, subdirs, d) if path.is_file())
+        # Entries are already known to be files, read_file_info reuses the DirEntry
+        yield from (read_file_info(entry, with_stat) for entry in _iterate_dir(d.path, subdirs, d, follow_symlinks))
+
+def _dir_configs_for_parent(parent: Path, dir_cfgs: list[DirectoryConfig]) -> list[tuple[DirectoryConfig, int]]:
+    # Return the configs whose directory contains the given parent directory,
+    # with the depth of the parent below the configured directory, most specific first.
+    # The containing directory is a prefix of the parent, so the depth is the
+    # difference in the number of parts, no need to search parents for it.
+    parents = parent.parents
+    nparts = len(parent.parts)
+    candidates = [
+        (dcfg, nparts - len(dcfg.path.parts))
+        for dcfg in dir_cfgs
+        if parent == dcfg.path or dcfg.path in parents
+    ]
+    candidates.sort(key=lambda c: c[1])
+    return candidates
+
+DirConfigLookup = Callable[[Path], list[tuple[DirectoryConfig, int]]]
+
+def _dir_config_lookup(dir_cfgs: list[DirectoryConfig]) -> DirConfigLookup:
+    # The containing configs only depend on the parent directory, so they are
+    # computed once per directory instead of once per file.
+    return lru_cache(maxsize=8192)(partial(_dir_configs_for_parent, dir_cfgs=dir_cfgs))
 
-def _get_directory_config_for_path(file_info: FileInfo | IncompleteFileInfo, dir_cfgs: list[DirectoryConfig]) -> DirectoryConfig | None:
-    # Given a path and a dict of directory configs, return the config that matches the path.
+def _get_directory_config_for_path(file_info: FileInfo | IncompleteFileInfo, dir_cfgs: DirConfigLookup) -> DirectoryConfig | None:
+    # Given a path and the directory config lookup, return the config that matches the path.
     # If any config has a pattern, the file must match it.
     # If multiple configs match, return the one with the longest path (most specific).
     # Among configs with the same path length, return the one with the pattern that matches.
     # If all have patterns, check the policy. Keep the one with the highest policy.
     # If no config matches, return None.
 
+    candidates = dir_cfgs(file_info.path.parent)
+    if len(candidates) == 1:
+        # Common case: a single configured directory contains the file.
+        dcfg, _ = candidates[0]
+        return dcfg if dcfg.pattern is None or dcfg.pattern.match(file_info) else None
+
+    # Candidates are already sorted by depth
     valid_configs: dict[DirectoryConfig, int] = {
-        dcfg: file_info.path.parents.index(dcfg.path)
-        for dcfg in dir_cfgs
-        if (
-            file_info.path.is_relative_to(dcfg.path) and (
-                # If the config has a pattern, the file must match it.
-                dcfg.pattern is None or dcfg.pattern.match(file_info)
-            )
-        )
+        dcfg: depth
+        for dcfg, depth in candidates
+        # If the config has a pattern, the file must match it.
+        if dcfg.pattern is None or dcfg.pattern.match(file_info)
     }
     
     if not valid_configs:
         return None
     
-    configs = sorted(valid_configs, key=lambda e: valid_configs[e])
+    configs = list(valid_configs)
 
     # Check if any config has a pattern
     if any(dcfg.pattern is not None for dcfg in valid_configs):
@@ -219,133 +263,169 @@ def _get_directory_config_for_path(file_info: FileInfo | IncompleteFileInfo, dir
 
     return max(configs, key=lambda dcfg: policy_priority(dcfg.policy))
 
-def _add_new_files_th(iter: ThreadSafeIterator[IncompleteFileInfo], config: Config, db: StatDB, checked_files: ThreadSafeSet[Path]):
+def _add_new_files_th(batches: ThreadSafeIterator[tuple[IncompleteFileInfo, ...]], config: Config, db: StatDB, checked_files: set[Path], stated: bool, dir_cfgs: DirConfigLookup):
     log = logging.getLogger("filesweep")
-    for file_info_inc in iter:
-        # Check if the file matches the global pattern
-        if not config.pattern.match(file_info_inc):
-            continue
-        if file_info_inc.path in checked_files:
-            # Happens if multiple directories overlap
-            continue
-
-        _dircfg = _get_directory_config_for_path(file_info_inc, config.dirs)
-        
-        if _dircfg is None:
-            continue
-
-        checked_files.add(file_info_inc.path)
-
-        # Check if the file is already in the database
-        # First check by path, then by inode.
+    # Each thread takes a whole batch per lock acquisition on the shared iterator
+    for file_info_inc in chain.from_iterable(batches):
+        try:
+            _add_new_file(file_info_inc, config, db, checked_files, stated, dir_cfgs, log)
+        except Exception as e:
+            # An error must not end the thread, or the rest of its batch would be skipped.
+            # The file was not checked, so its database entry is kept rather than removed as stale.
+            checked_files.add(file_info_inc.path)
+            log.exception(f"Error processing file {file_info_inc.path}: {e}")
+
+def _add_new_file(file_info_inc: IncompleteFileInfo, config: Config, db: StatDB, checked_files: set[Path], stated: bool, dir_cfgs: DirConfigLookup, log: logging.Logger):
+    # Check if the file matches the global pattern
+    if not config.pattern.match(file_info_inc):
+        return
+    if file_info_inc.path in checked_files:
+        # Happens if multiple directories overlap
+        return
+
+    if not stated:
+        # The global pattern only needed the path, stat the file now that it matched.
+        try:
+            file_info_inc = read_file_info(file_info_inc.path)
+        except FileNotFoundError as e:
+            log.error(f"Error accessing file {file_info_inc.path}: {e}")
+            return
+        except PermissionError as e:
+            # The file still exists, keep its database entry
+            checked_files.add(file_info_inc.path)
+            log.error(f"Error accessing file {file_info_inc.path}: {e}")
+            return
 
-        db_entry_bypath = db.get_item(path = file_info_inc.path, return_index=True)
-        if db_entry_bypath is not None:
-            _, db_entry_bypath = db_entry_bypath
-        db_entry_bydvin = db.get_item(device_inode = (file_info_inc.device, file_info_inc.inode), return_index=True)
-        if db_entry_bydvin is not None:
-            db_entry_bydvin_idx, db_entry_bydvin = db_entry_bydvin
-        else:
-            db_entry_bydvin_idx = -1
+    _dircfg = _get_directory_config_for_path(file_info_inc, dir_cfgs)
+    
+    if _dircfg is None:
+        return
+
+    checked_files.add(file_info_inc.path)
+
+    # Check if the file is already in the database
+    # First check by path, then by inode.
+
+    db_entry_bypath, db_entry_bydvin = db.lookup_path_and_dvin(file_info_inc.path, (file_info_inc.device, file_info_inc.inode))
+    if db_entry_bypath is not None:
+        _, db_entry_bypath = db_entry_bypath
+        # Unchanged file: the stats match the cached entry, trust it and skip the file.
+        if (db_entry_bypath.size == file_info_inc.size and db_entry_bypath.modified == file_info_inc.modified
+                and db_entry_bypath.device == file_info_inc.device and db_entry_bypath.inode == file_info_inc.inode):
+            return
+    if db_entry_bydvin is not None:
+        db_entry_bydvin_idx, db_entry_bydvin = db_entry_bydvin
+    else:
+        db_entry_bydvin_idx = -1
 
-        # Possible scenarios:
-        # 1. File is in the database by path and inode, with same path: update its info if needed
-        # 2. File is in the database by inode only: it was moved/renamed, update its path and info if needed
-        # 3. File is in the database by path only: it was replaced by another file, treat as new file
-        # 4. File is not in the database: new file, add it
-        
-        # action, item, old, old_idx = None, None, None, None
-        old_idx = -1 # Unbound check
-        try:
-            match db_entry_bypath, db_entry_bydvin:
-                case _, None:
-                    # New file, add it to the database
-                    f16b = read_16b(file_info_inc.path)
+    # Possible scenarios:
+    # 1. File is in the database by path and inode, with same path: update its info if needed
+    # 2. File is in the database by inode only: it was moved/renamed, update its path and info if needed
+    # 3. File is in the database by path only: it was replaced by another file, treat as new file
+    # 4. File is not in the database: new file, add it
+    
+    # action, item, old, old_idx = None, None, None, None
+    old_idx = -1 # Unbound check
+    try:
+        if db_entry_bydvin is None:
+            # New file, add it to the database
+            f16b = read_16b(file_info_inc.path)
+            hash = hash_file(file_info_inc.path, config.performance.algorithm, config.performance.chunk_size, config.performance.max_read)
+            action = "add"
+            item = file_info_inc.complete(first_16b=f16b, file_hash=hash)
+
+        elif db_entry_bypath is None:
+            # File was probably moved/renamed. Check stats, if necessary then
+            # check file content. If small file, hash, else first check f16b.
+            # If hash matches, update the path in the database.
+            # If not, treat as new file.
+            # The first 16 bytes and the hash are read lazily: each at most once,
+            # and only when compared or stored in a new entry.
+            file_info_db = db_entry_bydvin
+            f16b: str | None = None
+            hash: str | None = None
+            action = "add"
+
+            # Check stats against already known file. If size or modified time
+            # differs, treat as new file without reading its content.
+            if (file_info_inc.size == file_info_db.size) and (file_info_inc.modified == file_info_db.modified):
+                # Check f16b / hash. If config.performance.small_file_size is None, always hash.
+                if config.performance.small_file_size is None or file_info_inc.size <= config.performance.small_file_size:
+                    # Small file, hash it directly
                     hash = hash_file(file_info_inc.path, config.performance.algorithm, config.performance.chunk_size, config.performance.max_read)
-                    action = "add"
-                    item = file_info_inc.complete(first_16b=f16b, file_hash=hash)
-
-                case None, FileInfo() as file_info_db:
-                    # File was probably moved/renamed. Check stats, if necessary then
-                    # check file content. If small file, hash, else first check f16b.
-                    # If hash matches, update the path in the database.
-                    # If not, treat as new file.
-                    
+                    same_file = hash == file_info_db.file_hash
+                else:
+                    # Large file, check first 16 bytes
                     f16b = read_16b(file_info_inc.path)
-                    # Check stats against already known file
-                    if (file_info_inc.size != file_info_db.size) or (file_info_inc.modified != file_info_db.modified):
-                        # Size or modified time differs, treat as new file
-                        hash = hash_file(file_info_inc.path, config.performance.algorithm, config.performance.chunk_size, config.performance.max_read)
-                        item = file_info_inc.complete(first_16b=f16b, file_hash=hash)
-                        action = "add"
-                    else:
+                    same_file = f16b == file_info_db.first_16b
 
-                        # Check f16b / hash. If config.performance.small_file_size is None, always hash.
-                        if config.performance.small_file_size is None or file_info_inc.size <= config.performance.small_file_size:
-                            # Small file, hash it directly
-                            hash = hash_file(file_info_inc.path, config.performance.algorithm, config.performance.chunk_size, config.performance.max_read)
-                            if hash == file_info_db.file_hash:
-                                # Same file, update path
-                                action = "update"
-                                item = file_info_db._replace(path=file_info_inc.path)
-                                old_idx = db_entry_bydvin_idx
-                            else:
-                                # Different file, add as new
-                                action = "add"
-                                item = file_info_inc.complete(first_16b=f16b, file_hash=hash)
-                        else:
-                            # Large file, check first 16 bytes
-                            if f16b == file_info_db.first_16b:
-                                # Same file, update path
-                                action = "update"
-                                item = file_info_db._replace(path=file_info_inc.path)
-                                old_idx = db_entry_bydvin_idx
-                            else:
-                                # Different file, hash and add as new
-                                hash = hash_file(file_info_inc.path, config.performance.algorithm, config.performance.chunk_size, config.performance.max_read)
-                                action = "add"
-                                item = file_info_inc.complete(first_16b=f16b, file_hash=hash)
-                    
-                case FileInfo() as file_info_db_1, FileInfo() as file_info_db_2:
-                    # The file is already in the database, matching by both path and inode.
-                    # Check if the two entries are the same. If not, log a warning and skip the file.
-                    # If they are the same, do nothing.
-                    if file_info_db_1.path != file_info_db_2.path:
-                        log.warning(f"File {file_info_inc.path} has conflicting database entries. Consider deleting cached data. Skipping...")
-                    log.debug(f"Processed file: {file_info_db_1.path} (mtime: {file_info_db_1.modified}, size: {file_info_db_1.size}, hash: {file_info_db_1.file_hash})")
-                    continue
+                if same_file:
+                    # Same file, update path
+                    action = "update"
+                    item = file_info_db._replace(path=file_info_inc.path, name=file_info_inc.name, suffix=file_info_inc.suffix)
+                    old_idx = db_entry_bydvin_idx
 
-                case _:
-                    raise RuntimeError("Unhandled database entry case, this should not happen.")
+            if action == "add":
+                # Different file, add as new
+                if f16b is None:
+                    f16b = read_16b(file_info_inc.path)
+                if hash is None:
+                    hash = hash_file(file_info_inc.path, config.performance.algorithm, config.performance.chunk_size, config.performance.max_read)
+                item = file_info_inc.complete(first_16b=f16b, file_hash=hash)
             
-            match action:
-                case "add":
+        else:
+            # The file is already in the database, matching by both path and inode.
+            # Check if the two entries are the same. If not, log a warning and skip the file.
+            # If they are the same, do nothing.
+            file_info_db_1, file_info_db_2 = db_entry_bypath, db_entry_bydvin
+            if file_info_db_1.path != file_info_db_2.path:
+                log.warning(f"File {file_info_inc.path} has conflicting database entries. Consider deleting cached data. Skipping...")
+            log.debug("Processed file: %s (mtime: %s, size: %s, hash: %s)", file_info_db_1.path, file_info_db_1.modified, file_info_db_1.size, file_info_db_1.file_hash)
+            return
+
+        
+        if action == "add":
+            if db_entry_bypath is not None:
+                # Another file now has this path, it replaces the old entry
+                with db.transaction():
+                    db.pop_item(path=item.path)
                     db.add_item(item)
-                    log.info(f"Added file: {item.path} (size: {item.size}, modified: {item.modified}, hash: {item.file_hash})")
-                case "update":
-                    if old_idx < 0:
-                        raise RuntimeError("Old index is -1, this should not happen.")
-                    db.update_item(item, old_idx)
-                    log.info(f"Updated file: {item.path} (size: {item.size}, modified: {item.modified}, hash: {item.file_hash})")
-            
-            log.debug(f"Processed file: {item.path} (mtime: {item.modified}, size: {item.size}, hash: {item.file_hash})")
+            else:
+                db.add_item(item)
+            log.info(f"Added file: {item.path} (size: {item.size}, modified: {item.modified}, hash: {item.file_hash})")
+        elif action == "update":
+            if old_idx < 0:
+                raise RuntimeError("Old index is -1, this should not happen.")
+            db.update_item(item, old_idx)
+            log.info(f"Updated file: {item.path} (size: {item.size}, modified: {item.modified}, hash: {item.file_hash})")
         
-        except (PermissionError, FileNotFoundError) as e:
-            log.error(f"Error accessing file {file_info_inc.path}: {e}")
+        log.debug("Processed file: %s (mtime: %s, size: %s, hash: %s)", item.path, item.modified, item.size, item.file_hash)
+    
+    except (PermissionError, FileNotFoundError) as e:
+        log.error(f"Error accessing file {file_info_inc.path}: {e}")
 
 
+# Number of files handed to a scanning thread at once
+SCAN_BATCH_SIZE = 64
+
 def _add_new_files(config: Config, db: StatDB) -> set[Path]:
     log = logging.getLogger("filesweep")
 
-    _checked_files: set[Path] = ThreadSafeSet()
-    _all_files = iterate_files(config)
-    all_files = ThreadSafeIterator(_all_files)
+    # Single set.add and membership tests are atomic in CPython, so the set needs no lock.
+    # Two threads could still both pass the membership test for the same path, as before.
+    _checked_files: set[Path] = set()
+    # Only stat files during discovery if the global pattern needs the stat fields,
+    # otherwise files rejected by name are never stat'ed.
+    stated = not config.pattern.required_fields().isdisjoint(STAT_FIELDS)
+    _all_files = iterate_files(config, stated)
+    all_files = ThreadSafeIterator(batched(_all_files, SCAN_BATCH_SIZE))
 
     nthreads = config.performance.max_threads or 1
     log.debug(f"Starting new file check with {nthreads} threads...")
 
-    threads = [Thread(target=_add_new_files_th, args=(all_files, config, db, _checked_files), daemon=True)
-               for _ in range(config.performance.max_threads or 1)]
+    dir_cfgs = _dir_config_lookup(config.dirs)
+    threads = [Thread(target=_add_new_files_th, args=(all_files, config, db, _checked_files, stated, dir_cfgs), daemon=True)
+               for _ in range(nthreads)]
     for t in threads:
         t.start()
     for t in threads:
@@ -355,12 +435,13 @@ def _add_new_files(config: Config, db: StatDB) -> set[Path]:
 
 def _check_stale_files(checked_files: set[Path], db: StatDB):
     log = logging.getLogger("filesweep")
-    _db_paths = set(db.path_index.keys())
-    stale_paths = _db_paths - checked_files
+    # Collect the stale paths without copying the whole path index, then remove them in one batch.
+    with db.transaction():
+        stale_paths = [path for path in db.path_index if path not in checked_files]
+        stale_items = db.pop_items(paths = stale_paths)
 
-    for stale_path in stale_paths:
-        db.pop_item(path = stale_path)
-        log.info(f"Removed stale file from database: {stale_path}")
+    for stale_item in stale_items:
+        log.info(f"Removed stale file from database: {stale_item.path}")
 
 def update_db(config: Config, db: StatDB):
     log = logging.getLogger("filesweep")
@@ -371,32 +452,33 @@ def update_db(config: Config, db: StatDB):
     
     log.info(f"Database update complete. {len(db)} entries in database.")
 
-def check_db(config: Config, db: StatDB, decision_queue: Queue[Decision]):
+def check_db(config: Config, db: StatDB, decisions: SimpleQueue[Decision | None]):
     log = logging.getLogger("filesweep")
+    dir_cfgs = _dir_config_lookup(config.dirs)
     # Read the entire database, grouped by hash. For each group, decide what to do.
-    for _, idxs in db.hash_index.groups():
-        pass
-        # if len(idxs) == 1: continue
-        
+    for group in db.hash_groups():
         # We have duplicates with the given hash. Decide what to do with them.
         # Get all configs for each file. Will be stored in the decision struct.
         hash_decisions: dict[int, Decision] = {}
-        for idx in idxs:
-            file_info = db.get_item(index = idx)
-            if file_info is None:
-                log.error(f"Error retrieving file info for index {idx}, skipping...")
-                continue
-
+        for idx, file_info in group:
             # Get the directory config for this file as a dict, with config as key and
             # path depth as value.
-            _dircfg = _get_directory_config_for_path(file_info, config.dirs)
+            _dircfg = _get_directory_config_for_path(file_info, dir_cfgs)
             if _dircfg is None:
                 # No matching config, keep the file and log warning
                 log.warning(f"File {file_info.path} has no matching directory configuration, keeping by default.")
+                if len(group) == 1:
+                    continue
                 hash_decisions[idx] = Decision(None, idx, file_info, action=Action.NOACTION) # No config, keep but do not check # type: ignore
+            elif len(group) == 1 and _dircfg.policy not in (Policy.DISCARD, Policy.ERASE):
+                # A file without duplicates is left alone, unless its policy also acts on unique files.
+                continue
             else:
                 hash_decisions[idx] = Decision(_dircfg, idx, file_info, action=Action.UNDEFINED)
         
+        if not hash_decisions:
+            continue
+
         # Now we have the decision dict[index, Decision] for each file, we can decide what to do.
 
         # All files without a matching config are kept (config = None, already set above).
@@ -423,79 +505,82 @@ def check_db(config: Config, db: StatDB, decision_queue: Queue[Decision]):
         # If there is no `keep` but at least one `link`, link all `link` to the highest priority `link` and delete all `delete`.
         # If there is only `delete`, keep the highest priority `delete` and delete the rest.
         for idx, decision in hash_decisions.items():
-            match decision, _highest_decision:
-                case a,b if a.dircfg.policy > b.dircfg.policy:
-                    # The highest policy is always highest (should always be true)
-                    raise RuntimeError("This should not happen, highest policy is not highest in the list.")
+            # Plain if/elif chain over precomputed values, checked in priority order.
+            a, b = decision, _highest_decision
+            policy = a.dircfg.policy
+            is_winner = a is b
+            if policy > b.dircfg.policy:
+                # The highest policy is always highest (should always be true)
+                raise RuntimeError("This should not happen, highest policy is not highest in the list.")
                 
-                case a,b if a == b and a.dircfg.policy == Policy.DISCARD:
-                    # This is the highest priority file. Discard policy means send to trash even if no duplicates.
-                    decision.action = Action.TRASH
-                case a,b if a == b and a.dircfg.policy == Policy.ERASE:
-                    # This is the highest priority file. Erase policy means delete even if no duplicates.
-                    decision.action = Action.DELETE
-
-                # Check if we are in a rename folder with TRASH or DELETE policy
-                case a,b if a == b and a.dircfg.rename and a.dircfg.policy in (Policy.TRASH, Policy.DELETE):
-                    # This is the highest priority file. We need to retime it to the newest file time.
-                    decision.action = Action.RETIME
-                    # If no other file, retime to its own modified time
+            elif is_winner and policy == Policy.DISCARD:
+                # This is the highest priority file. Discard policy means send to trash even if no duplicates.
+                decision.action = Action.TRASH
+            elif is_winner and policy == Policy.ERASE:
+                # This is the highest priority file. Erase policy means delete even if no duplicates.
+                decision.action = Action.DELETE
+
+            # Check if we are in a rename folder with TRASH or DELETE policy
+            elif is_winner and a.dircfg.rename and policy in (Policy.TRASH, Policy.DELETE):
+                # This is the highest priority file. We need to retime it to the newest file time.
+                decision.action = Action.RETIME
+                # If no other file, retime to its own modified time
+                if _highest_decision.time is None:
+                    _highest_decision.time = a.file_info.modified
+                else:
+                    _highest_decision.time = max(_highest_decision.time, a.file_info.modified)
+                decision.time
+
+            elif a.dircfg.path == b.dircfg.path and a.dircfg.rename and policy in (Policy.TRASH, Policy.DELETE):
+                # We are in the same folder as the winner file, but this is not the highest priority file.
+                # This file will not be kept, and the winner file will be retimed to the newest modified time.
+                if b.action in (Action.UNDEFINED, Action.RETIME):
+                    b.action = Action.RETIME
                     if _highest_decision.time is None:
                         _highest_decision.time = a.file_info.modified
                     else:
                         _highest_decision.time = max(_highest_decision.time, a.file_info.modified)
-                    decision.time
-
-                case a,b if a.dircfg.path == b.dircfg.path and a.dircfg.rename and a.dircfg.policy in (Policy.TRASH, Policy.DELETE):
-                    # We are in the same folder as the winner file, but this is not the highest priority file.
-                    # This file will not be kept, and the winner file will be retimed to the newest modified time.
-                    if b.action in (Action.UNDEFINED, Action.RETIME):
-                        b.action = Action.RETIME
-                        if _highest_decision.time is None:
-                            _highest_decision.time = a.file_info.modified
-                        else:
-                            _highest_decision.time = max(_highest_decision.time, a.file_info.modified)
-                    else:
-                        raise RuntimeError("This should not happen, retime action already set to something else.")
-                    
-                    if a.dircfg.policy == Policy.TRASH:
-                        decision.action = Action.TRASH
-                        decision.target = b.file_info.path
-                    elif a.dircfg.policy == Policy.DELETE:
-                        decision.action = Action.DELETE
-                        decision.target = b.file_info.path
-                    else:
-                        raise RuntimeError("This should not happen, invalid policy for retime.")
-                    
-                case a,b if a == b:
-                    # In all other cases, take no action for the highest priority file.
-                    decision.action = Action.NOACTION
-
-                case a, _ if a.dircfg.policy == Policy.KEEP:
-                    # Always keep
-                    decision.action = Action.KEEP
-                
-                case a, _ if a.dircfg.policy == Policy.PROMPT:
-                    # Not implemented, treat as keep
-                    log.warning(f"Policy prompt not yet implemented, treating as keep for file {decision.file_info.path}...")
-                    decision.action = Action.KEEP
-                case a, _ if a.dircfg.policy == Policy.HARDLINK:
-                    # Not implemented, treat as keep
-                    log.warning(f"Policy hardlink not yet implemented, treating as keep for file {decision.file_info.path}...")
-                    decision.action = Action.KEEP
+                else:
+                    raise RuntimeError("This should not happen, retime action already set to something else.")
                 
-                case a, b if a.dircfg.policy == Policy.TRASH and b.dircfg.policy >= Policy.TRASH:
-                    # Trash if there is a higher policy, else take no action
+                if policy == Policy.TRASH:
                     decision.action = Action.TRASH
                     decision.target = b.file_info.path
-                
-                case a, b if a.dircfg.policy == Policy.DELETE and b.dircfg.policy >= Policy.DELETE:
-                    # Delete if there is a higher policy, else take no action
+                elif policy == Policy.DELETE:
                     decision.action = Action.DELETE
                     decision.target = b.file_info.path
+                else:
+                    raise RuntimeError("This should not happen, invalid policy for retime.")
+                
+            elif is_winner:
+                # In all other cases, take no action for the highest priority file.
+                decision.action = Action.NOACTION
 
-                case _:
-                    decision.action = Action.NOACTION
+            elif policy == Policy.KEEP:
+                # Always keep
+                decision.action = Action.KEEP
+                
+            elif policy == Policy.PROMPT:
+                # Not implemented, treat as keep
+                log.warning(f"Policy prompt not yet implemented, treating as keep for file {decision.file_info.path}...")
+                decision.action = Action.KEEP
+            elif policy == Policy.HARDLINK:
+                # Not implemented, treat as keep
+                log.warning(f"Policy hardlink not yet implemented, treating as keep for file {decision.file_info.path}...")
+                decision.action = Action.KEEP
+                
+            elif policy == Policy.TRASH and b.dircfg.policy >= Policy.TRASH:
+                # Trash if there is a higher policy, else take no action
+                decision.action = Action.TRASH
+                decision.target = b.file_info.path
+                
+            elif policy == Policy.DELETE and b.dircfg.policy >= Policy.DELETE:
+                # Delete if there is a higher policy, else take no action
+                decision.action = Action.DELETE
+                decision.target = b.file_info.path
+
+            else:
+                decision.action = Action.NOACTION
 
         for final_decision in hash_decisions.values():
             # Check retime action. If time is the same as current file time, convert to noaction.
@@ -503,23 +588,23 @@ def check_db(config: Config, db: StatDB, decision_queue: Queue[Decision]):
                 final_decision.action = Action.NOACTION
                 final_decision.time = None
             
-            log.debug(f"Decision for file {final_decision.file_info.path}: {final_decision.action.name} (policy: {final_decision.dircfg.policy.name if final_decision.dircfg else 'None'}, target: {final_decision.target})")
-            decision_queue.put(final_decision)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"Decision for file {final_decision.file_info.path}: {final_decision.action.name} (policy: {final_decision.dircfg.policy.name if final_decision.dircfg else 'None'}, target: {final_decision.target})")
+            decisions.put(final_decision)
 
-def act_decisions(decision_queue: Queue[Decision], db: StatDB, dry_run: bool) -> int:
+def act_decisions(decisions: SimpleQueue[Decision | None], db: StatDB, dry_run: bool) -> int:
+    # Consumes decisions as check_db produces them, until the None sentinel.
     saved_space = 0
     log = logging.getLogger("filesweep")
 
-    try:
-        while True:
-            decision = decision_queue.get(block=False)
-
+    while (decision := decisions.get()) is not None:
+        try:
             match decision.action:
                 case Action.UNDEFINED:
                     log.error(f"Undefined action for file {decision.file_info.path}, skipping...")
                     continue
                 case Action.NOACTION:
-                    log.debug(f"Keeping file {decision.file_info.path} (no action).")
+                    log.debug("Keeping file %s (no action).", decision.file_info.path)
                 case Action.KEEP:
                     log.info(f"Keeping file {decision.file_info.path}.")
                 case Action.RETIME:
@@ -557,13 +642,9 @@ def act_decisions(decision_queue: Queue[Decision], db: StatDB, dry_run: bool) ->
                             log.info(f"Deleted file {decision.file_info.path}, freed {human_size(decision.file_info.size)}.")
                         except Exception as e:
                             log.error(f"Error deleting file {decision.file_info.path}: {e}")
+        except Exception as e:
+            log.error(f"Error processing decision for file {decision.file_info.path}: {e}")
 
-            decision_queue.task_done()
-    except Empty:
-        return saved_space
-    except Exception as e:
-        log.error(f"Error processing decisions: {e}")
-    
     return saved_space
 
 def main(config: Config, db: StatDB):
@@ -582,16 +663,23 @@ def main(config: Config, db: StatDB):
         if d.pattern is not None:
             log.debug(f"       Pattern: {d.pattern!r}")
 
+    # Date patterns are evaluated against the time at which the scan started.
+    config = config.bind(time_ns())
+
     # Update the database with all files currently present in the configured directories.
     update_db(config, db)
     
     # Check the entire database.
     # The decision queue stores decisions to be made about all files.
-    decision_queue = Queue[Decision]()
-    check_db(config, db, decision_queue)
-
-    # Act on the decisions in the queue.
-    saved_space = act_decisions(decision_queue, db, config.general.dry_run)
+    # Decisions are acted on in a separate thread while the database is still being checked.
+    decisions = SimpleQueue[Decision | None]()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        acting = executor.submit(act_decisions, decisions, db, config.general.dry_run)
+        try:
+            check_db(config, db, decisions)
+        finally:
+            decisions.put(None)
+        saved_space = acting.result()
 
     if config.general.dry_run:
         log.info("Dry run complete. No files were deleted or modified.")
@@ -1,15 +1,26 @@
 import hashlib
+import os
+
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterable
 
-class _builtin_hash:
-    def __init__(self):
-        self._value = 0
+# Optional: BLAKE3 is much faster than the hashlib algorithms on large files
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
 
-    def update(self, data: bytes):
-        self._value = hash((self._value, data))
+# Optional: xxHash, a fast non-cryptographic hash
+try:
+    from xxhash import xxh64 as _xxh64
+except ImportError:
+    _xxh64 = None
 
-    def hexdigest(self) -> str:
-        return f"{self._value & 0xFFFFFFFFFFFFFFFF:016x}"
+# Named constructors, resolved once. hashlib binds these to the OpenSSL
+# implementations when available (using SHA-NI etc. where the CPU supports it),
+# and skips the name lookup done by hashlib.new on every call.
+_HASH_CONSTRUCTORS = {name: getattr(hashlib, name) for name in hashlib.algorithms_guaranteed}
 
 def hash_file(path: Path, algorithm: str, chunk_size: int | None = None, max_read: int | None = None) -> str:
     with open(path, 'rb') as f:
@@ -17,35 +28,83 @@ def hash_file(path: Path, algorithm: str, chunk_size: int | None = None, max_rea
         # Use the specified algorithm to hash the file
         algorithm = algorithm.lower()
         if algorithm in ("py", "python"):
-            hash_alg = _builtin_hash()
+            # Fast 64-bit digest from the standard library. Unlike the builtin
+            # hash(), it is not salted per process, so cached digests stay valid.
+            hash_alg = hashlib.blake2b(digest_size=8, usedforsecurity=False)
+        elif algorithm in ("xxhash", "xxh64"):
+            if _xxh64 is None:
+                raise ValueError("The xxhash hash algorithm requires the xxhash package")
+            hash_alg = _xxh64()
+        elif algorithm == "blake3":
+            if _blake3 is None:
+                raise ValueError("The blake3 hash algorithm requires the blake3 package")
+            hash_alg = _blake3()
+        elif algorithm in _HASH_CONSTRUCTORS:
+            hash_alg = _HASH_CONSTRUCTORS[algorithm](usedforsecurity=False)
         elif algorithm in hashlib.algorithms_available:
-            hash_alg = hashlib.new(algorithm)
+            hash_alg = hashlib.new(algorithm, usedforsecurity=False)
         else:
             raise ValueError(f"Unsupported hash algorithm: {algorithm}")
 
+        if max_read is None:
+            # The whole file is hashed, so the read size does not matter. file_digest
+            # reads into a single reused buffer without allocating bytes per chunk,
+            # and update() releases the GIL while hashing.
+            return hashlib.file_digest(f, lambda: hash_alg).hexdigest()
+
+        # With max_read, the digest covers max_read bytes rounded up to a whole
+        # chunk_size, so the chunk size must stay as configured to keep cached
+        # digests valid. Read into a single reused buffer.
+        buffer = memoryview(bytearray(chunk_size or 8192))
         read = 0
-        while (chunk := f.read(chunk_size or 8192)):
-            hash_alg.update(chunk)
-            read += len(chunk)
+        while (n := f.readinto(buffer)):
+            hash_alg.update(buffer[:n])
+            read += n
             if max_read is not None and read >= max_read:
                 break
         return hash_alg.hexdigest()
 
+def hash_files(paths: Iterable[Path], algorithm: str, workers: int | None = None, chunk_size: int | None = None, max_read: int | None = None) -> dict[Path, str]:
+    # Hash several files in parallel. The hashing releases the GIL, so the threads
+    # overlap both the reads and the digest computation.
+    paths = list(paths)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        digests = executor.map(lambda path: hash_file(path, algorithm, chunk_size, max_read), paths)
+        return dict(zip(paths, digests))
+
+# O_BINARY only exists, and is only needed, on Windows
+_HEAD_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+
+def _read_head(path: Path, size: int) -> bytes:
+    # Read the first size bytes through a raw file descriptor, skipping the
+    # buffered file object (and its 8 KiB buffer) that open() would create.
+    fd = os.open(path, _HEAD_OPEN_FLAGS)
+    try:
+        data = os.read(fd, size)
+        # A raw read may return less than asked for (pipes, some network
+        # filesystems), keep reading until size bytes or the end of the file.
+        while len(data) < size and (more := os.read(fd, size - len(data))):
+            data += more
+        return data
+    finally:
+        os.close(fd)
+
+# _ROTATE[n][b] is the byte b rotated left by n bits
+_ROTATE = [bytes(((b << n) & 0xFF) | (b >> (8 - n)) for b in range(256)) for n in range(8)]
+
 def read_16b(file: Path) -> str:
     # Read the first 64 bytes of a file, and mash it to get 16 bytes which should be enough to distinguish files.
-    with open(file, "rb") as f:
-        bs = [bytearray(f.read(16).ljust(16, b'\0')) for _ in range(4)]
-
-    res = bytearray(16)
-
-    for i in range(16):
-        val = 0
-        for j, chunk in enumerate(bs):
-            # Rotate each byte by (i + j) bits and XOR into accumulator
-            n = (i + j) % 8
-            rotated = ((chunk[i] << n) & 0xFF) | (chunk[i] >> (8 - n))
-            val ^= rotated
-        res[i] = val
+    # Read in one call, missing bytes are zero. Chunk j is data[16*j:16*j+16].
+    data = _read_head(file, 64).ljust(64, b'\0')
+
+    # Rotate each byte by (i + j) bits and XOR into accumulator, rotations are table lookups
+    res = bytes(
+        _ROTATE[i & 7][data[i]]
+        ^ _ROTATE[(i + 1) & 7][data[16 + i]]
+        ^ _ROTATE[(i + 2) & 7][data[32 + i]]
+        ^ _ROTATE[(i + 3) & 7][data[48 + i]]
+        for i in range(16)
+    )
 
     # Return as hex string
     return res.hex()
\ No newline at end of file
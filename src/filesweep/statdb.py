@@ -2,13 +2,40 @@ from __future__ import annotations
 
 import gzip
 import json
-
+import os
+import sys
+
+from array import array
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import partial
+from itertools import chain, repeat
 from pathlib import Path
-from threading import Lock
-from typing import Generic, TypeVar, Collection, Iterable, overload, Literal, TypedDict
+from threading import RLock
+from typing import Any, Generic, TypeVar, Collection, Iterable, Iterator, overload, Literal, TypedDict, BinaryIO, Callable, MutableSequence
 
 from filesweep.config.classes import FileInfo
 
+# Optional: orjson encodes and decodes the cache several times faster than json.
+# Both produce the same JSON, so caches written by either can be read by the other.
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+def _json_dumps(data: object) -> bytes:
+    if _orjson is not None:
+        return _orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+def _json_loads(data: bytes) -> Any:
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+# Serialized FileInfo keys, in field order
+_FILEINFO_KEYS = ('fp', 'sz', 'mt', 'at', 'ct', 'in', 'dv', 'fh', '16')
+
 def _ser_fileinfo(f: FileInfo) -> dict[str, str|int|None]:
     return {
         'fp': str(f.path),
@@ -23,51 +50,123 @@ def _ser_fileinfo(f: FileInfo) -> dict[str, str|int|None]:
     }
 
 def _de_fileinfo(d: dict[str, str|int|None]) -> FileInfo:
+    return _de_fileinfo_row(*(d[k] for k in _FILEINFO_KEYS))
+
+def _de_fileinfo_row(fp: str|int|None, sz: str|int|None, mt: str|int|None, at: str|int|None, ct: str|int|None,
+                     in_: str|int|None, dv: str|int|None, fh: str|int|None, f16: str|int|None) -> FileInfo:
+    path = Path(str(fp))
     return FileInfo(
-        Path(str(d['fp'])),
-        int(d['sz'] or -1),
-        int(d['mt'] or -1),
-        int(d['at'] or -1),
-        int(d['ct'] or -1),
-        int(d['in'] or -1),
-        int(d['dv'] or -1),
-        str(d['fh']),
-        str(d['16']),
+        path,
+        int(sz or -1),
+        int(mt or -1),
+        int(at or -1),
+        int(ct or -1),
+        int(in_ or -1),
+        int(dv or -1),
+        # Equal digests share one string object, duplicates are what this tool looks for
+        sys.intern(str(fh)),
+        sys.intern(str(f16)),
+        path.name,
+        sys.intern(path.suffix),
     )
 
+# The cache stores files column by column: one list per key of _FILEINFO_KEYS,
+# so the keys are not repeated for every file. Caches written as a list of
+# dicts (under 'files') are still read.
 class SaveDataRepresentation(TypedDict):
-    files: list[dict[str, str|int|None]]
+    columns: dict[str, list[str|int|None]]
     collisions: list[tuple[str, str]]
 class SaveData(TypedDict):
     files: list[FileInfo]
     collisions: list[tuple[Path, Path]]
 
 def _load_cache(path: Path) -> SaveData:
-    with gzip.open(path, 'rt', encoding='utf-8') as f:
-        data = json.load(f)
+    # Decompress in one call instead of streaming through GzipFile
+    data = _json_loads(gzip.decompress(path.read_bytes()))
+    _collisions_d = data.get('collisions', [])
+    if 'columns' in data:
+        _columns = data['columns']
+        files: list[FileInfo] = [_de_fileinfo_row(*row) for row in zip(*(_columns[k] for k in _FILEINFO_KEYS))]
+        _paths_s = _columns['fp']
+    else:
         _files_d = data.get('files', [])
-        _collisions_d = data.get('collisions', [])
-        files: list[FileInfo] = [_de_fileinfo(v) for v in _files_d]
-        collisions: list[tuple[Path, Path]] = [(Path(p1), Path(p2)) for p1, p2 in _collisions_d]
-        return SaveData(files=files, collisions=collisions)
+        files = [_de_fileinfo(v) for v in _files_d]
+        _paths_s = [v['fp'] for v in _files_d]
+
+    # Collisions reuse the Path objects of the files, each path is parsed only once.
+    # Only the paths that appear in collisions are mapped, usually there are none.
+    path_cache: dict[str, Path] = {}
+    if _collisions_d:
+        _wanted = {s for pair in _collisions_d for s in pair}
+        path_cache = {s: f.path for s, f in zip(_paths_s, files) if s in _wanted}
+    def _P(s: str) -> Path:
+        p = path_cache.get(s)
+        if p is None:
+            p = path_cache[s] = Path(s)
+        return p
+    collisions: list[tuple[Path, Path]] = [(_P(p1), _P(p2)) for p1, p2 in _collisions_d]
+    return SaveData(files=files, collisions=collisions)
 
 def _save_cache(path: Path, cache_data: Iterable[FileInfo], accepted_collisions: Iterable[tuple[Path, Path]]) -> None:
-    cache = [_ser_fileinfo(v) for v in cache_data]
+    rows = [(str(f.path), f.size, f.modified, f.accessed, f.created, f.inode, f.device, f.file_hash, f.first_16b) for f in cache_data]
+    columns: list[tuple[str|int|None, ...]] = list(zip(*rows)) if rows else [() for _ in _FILEINFO_KEYS]
+    cache = {k: list(column) for k, column in zip(_FILEINFO_KEYS, columns)}
     collisions = [ (str(p1), str(p2)) for p1, p2 in accepted_collisions ]
 
-    data = SaveDataRepresentation(files=cache, collisions=collisions)
-    # Compress cache with gzip to save space
-    gzip_file = gzip.open(path, 'wt', encoding='utf-8')
-    with gzip_file as f:
-        json.dump(data, f)
+    data = SaveDataRepresentation(columns=cache, collisions=collisions)
+    # Compress cache with gzip to save space. The payload is serialized first and
+    # compressed in a single write. Level 1 is several times faster than the
+    # default level 9, for a slightly larger file.
+    payload = gzip.compress(_json_dumps(data), compresslevel=1)
+    # Write to a temporary file next to the cache and move it into place, so that
+    # a crash during the write leaves the previous cache intact.
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def _journal_path(cache_path: Path) -> Path:
+    # Changes made since the last save are appended here, one JSON record per line:
+    #       ["+", serialized FileInfo]  item added or replaced (by path)
+    #       ["-", path]                 item removed
+    return cache_path.with_name(cache_path.name + '.journal')
+
+def _truncate_partial_record(journal_path: Path) -> None:
+    # Drop a last record left without its newline by a crash, so that the next
+    # record does not get appended to it and lost with it.
+    try:
+        f = open(journal_path, 'r+b')
+    except FileNotFoundError:
+        return
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(pos - 4096, 0)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b'\n')
+            if newline >= 0:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos != end:
+            f.truncate(pos)
 
 _K = TypeVar('_K')
 _V = TypeVar('_V')
 class Bag(Collection[_K], Generic[_K, _V]):
     '''A bag is a dictionary that maps keys to lists of values.'''
+    # Creates the sequence holding the values of a new key
+    _new_values: Callable[[], MutableSequence[_V]] = list
 
     def __init__(self) -> None:
-        self._data: dict[_K, list[_V]] = {}
+        self._data: dict[_K, MutableSequence[_V]] = {}
         
     @classmethod
     def from_iter(cls, iterable: Iterable[tuple[_K, _V]]) -> Bag[_K, _V]:
@@ -76,25 +175,29 @@ class Bag(Collection[_K], Generic[_K, _V]):
             bag.add(k, v)
         return bag
     
-    def __getitem__(self, key: _K) -> list[_V]:
+    def __getitem__(self, key: _K) -> MutableSequence[_V]:
         return self._data[key]
     
     def add(self, key: _K, value: _V) -> None:
-        if key not in self:
-            self._data[key] = []
-        self[key].append(value)
+        # Single dict lookup when the key is present, this runs for every item loaded
+        values = self._data.get(key)
+        if values is None:
+            values = self._data[key] = self._new_values()
+        values.append(value)
 
     def __delitem__(self, key: _K) -> None:
         del self._data[key]
     
     def remove(self, key: _K, value: _V) -> None:
-        if key in self:
-            try:
-                self[key].remove(value)
-                if not self[key]:
-                    del self[key]
-            except ValueError:
-                pass
+        values = self._data.get(key)
+        if values is None:
+            return
+        try:
+            values.remove(value)
+        except ValueError:
+            return
+        if not values:
+            del self._data[key]
     
     def __iter__(self):
         return iter(self._data)
@@ -103,29 +206,35 @@ class Bag(Collection[_K], Generic[_K, _V]):
         return len(self._data)
     
     def __contains__(self, key: object) -> bool:
-        return self._data.__contains__(key)
+        return key in self._data
     
-    def groups(self) -> Iterable[tuple[_K, list[_V]]]:
+    def groups(self) -> Iterable[tuple[_K, MutableSequence[_V]]]:
         return self._data.items()
     
     def items(self) -> Iterable[tuple[_K, _V]]:
-        yield from ((k, v) for k, vs in self._data.items() for v in vs)
+        # Pairs are produced by zip and chain, only the keys are iterated in Python
+        return chain.from_iterable(zip(repeat(k), vs) for k, vs in self._data.items())
 
     def __repr__(self) -> str:
-        return f"Bag({self._data})"
+        return f"{type(self).__name__}({self._data})"
     
     def __str__(self) -> str:
         return str(self._data)
     
     def copy(self) -> Bag[_K, _V]:
-        new_bag = Bag[_K, _V]()
+        new_bag = type(self)()
         for k, vs in self._data.items():
-            new_bag._data[k] = vs.copy()
+            new_bag._data[k] = vs[:]
         return new_bag
     
     def clear(self) -> None:
         self._data.clear()
 
+class IndexBag(Bag[_K, int]):
+    '''A bag of database indexes, stored as 64 bit integers.'''
+    # An array stores 8 bytes per index, instead of a pointer to an int object
+    _new_values = partial(array, 'q')
+
 class ItemExistsError(Exception):...
 class ItemNotFoundError(Exception):...
 class InvalidItemError(Exception):...
@@ -138,36 +247,48 @@ class StatDB():
     # On disk, the database is stored as:
     #       list[FileInfo]
     # From this data, we can build the following dicts:
-    #       index -> FileInfo           dict
+    #       index -> FileInfo           list
     #       path -> index               dict
-    #       hash string -> list[index]  Bag
-    #       first bytes -> list[index]  Bag
+    #       hash string -> array[index] IndexBag
+    #       first bytes -> array[index] IndexBag
+    # Every change is also appended to a journal next to the cache file, so
+    # that changes survive a crash. load() replays it, save() compacts it into
+    # the cache file and removes it.
     def __init__(self, cache_path: Path | None):
         self.cache_path = cache_path
-        self._index = 0
-        self._lock = Lock()
+        # Reentrant, so that methods can be called inside a transaction()
+        self._lock = RLock()
         self._dirty = None
+        self._journal: BinaryIO | None = None
     
-    def _next_index(self) -> int:
-        self._index += 1
-        return self._index
-    
+    @contextmanager
+    def transaction(self) -> Iterator[StatDB]:
+        # Hold the database lock across several calls, so that other threads
+        # never observe the intermediate states.
+        with self._lock:
+            yield self
+
     def load(self) -> None:
         with self._lock:
             if self._dirty is not None:
                 raise RuntimeError("Database is already loaded.")
             self._dirty = False
             # Initialize database and indexes
-            # Main index, from database index to FileInfo
-            self.file_info: dict[int, FileInfo] = {}            # index -> FileInfo
+            # Main index, from database index to FileInfo. The index is the position in
+            # the list. Removed items leave a None, and their index is never reused
+            # while the database is loaded: a thread holding an index of a removed
+            # item must not find another item there. The cache only stores live
+            # items, so the list is compacted on the next load.
+            self.file_info: list[FileInfo | None] = []          # index -> FileInfo
+            self._removed = 0                                   # number of None slots
             # Unique indexes, from file / inode to index.
             # No two files can have the same path or inode/device.
             self.path_index: dict[Path, int] = {}               # Path -> index
             self.dvin_index: dict[tuple[int, int], int] = {}    # (inode, device) -> index
             # Non-unique indexes, from hash / first 16 bytes to list of indexes.
             # File contents may be duplicates, so these map to lists of indexes.
-            self.hash_index: Bag[str, int] = Bag()              # hash -> list[index]
-            self.f16b_index: Bag[str, int] = Bag()              # first 16 bytes -> list[index]
+            self.hash_index: IndexBag[str] = IndexBag()         # hash -> array[index]
+            self.f16b_index: IndexBag[str] = IndexBag()         # first 16 bytes -> array[index]
 
             if self.cache_path is None:
                 return
@@ -184,8 +305,53 @@ class StatDB():
             for finfo in cache:
                 self._add_item(finfo)
 
-            self.accepted_collisions = { (p1, p2) for p1, p2 in accepted }
-            self.accepted_collisions.update( (p2, p1) for p1, p2 in accepted ) # Make symmetric
+            # Symmetric adjacency: each path maps to the paths it was accepted to collide with
+            self.accepted_collisions: defaultdict[Path, set[Path]] = defaultdict(set)
+            for p1, p2 in accepted:
+                self.accepted_collisions[p1].add(p2)
+                self.accepted_collisions[p2].add(p1)
+
+            # Apply changes that were not saved, the next save compacts them into the cache
+            if self._replay_journal(_journal_path(self.cache_path)):
+                self._dirty = True
+
+    def _replay_journal(self, journal_path: Path) -> bool:
+        # Returns whether any change was replayed.
+        try:
+            journal = open(journal_path, 'rb')
+        except FileNotFoundError:
+            return False
+        replayed = False
+        with journal:
+            for line in journal:
+                try:
+                    op, data = _json_loads(line)
+                except (ValueError, TypeError):
+                    # Record cut short by a crash, the records after it are still valid
+                    continue
+                if op == '+':
+                    finfo = _de_fileinfo(data)
+                    index = self.path_index.get(finfo.path)
+                    if index is not None:
+                        self._pop_item(index)
+                    self._add_item(finfo)
+                elif op == '-':
+                    index = self.path_index.get(Path(data))
+                    if index is not None:
+                        self._pop_item(index)
+                replayed = True
+        return replayed
+
+    def _log_change(self, op: Literal['+', '-'], data: dict[str, str|int|None] | str) -> None:
+        # Append a change to the journal. Must be called with the lock held.
+        if self.cache_path is None:
+            return
+        if self._journal is None:
+            journal_path = _journal_path(self.cache_path)
+            _truncate_partial_record(journal_path)
+            # Unbuffered, each record is written out in a single write
+            self._journal = open(journal_path, 'ab', buffering=0)
+        self._journal.write(_json_dumps((op, data)) + b'\n')
     
     def save(self) -> None:
         with self._lock:
@@ -196,14 +362,21 @@ class StatDB():
             if self.cache_path is None:
                 raise ValueError("Cache path is None, cannot save cache.")
             # Desymmetrize accepted collisions
-            acceptedc = { (p1, p2) for p1, p2 in self.accepted_collisions if p1 < p2 }
-            _save_cache(self.cache_path, self.file_info.values(), acceptedc)
+            acceptedc = { (p1, p2) for p1, neighbors in self.accepted_collisions.items() for p2 in neighbors if p1 < p2 }
+            _save_cache(self.cache_path, (f for f in self.file_info if f is not None), acceptedc)
+            # All changes are now in the cache file, which has replaced the old one.
+            # Only now can the journal be dropped.
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            _journal_path(self.cache_path).unlink(missing_ok=True)
+            self._dirty = False
 
     def _add_item(self, finfo: FileInfo) -> int:
         # Add item to database and indexes. Does not perform any check.
-        idx = self._next_index()
+        idx = len(self.file_info)
+        self.file_info.append(finfo)
 
-        self.file_info[idx] = finfo
         self.path_index[finfo.path] = idx
         self.dvin_index[finfo.device, finfo.inode] = idx
 
@@ -223,6 +396,7 @@ class StatDB():
                 raise ItemExistsError(f"Item with path {finfo.path} already exists.")
             
             self._dirty = True
+            self._log_change('+', _ser_fileinfo(finfo))
             return self._add_item(finfo)
 
     
@@ -235,29 +409,65 @@ class StatDB():
     def pop_item(self, *, index: int | ellipsis = ..., path: Path | ellipsis = ..., device_inode: tuple[int,int] | ellipsis = ...) -> FileInfo:
         with self._lock:
             if index is not ...:
-                if index not in self.file_info:
-                    raise ItemNotFoundError(f"Item with index {index} not found.")
-                finfo = self.file_info[index]
+                try:
+                    finfo = self._info_at(index)
+                except KeyError:
+                    raise ItemNotFoundError(f"Item with index {index} not found.") from None
             elif path is not ...:
                 if path not in self.path_index:
                     raise ItemNotFoundError(f"Item with path {path} not found.")
                 index = self.path_index[path]
-                finfo = self.file_info[index]
+                finfo = self._live(index)
             elif device_inode is not ...:
                 index = self.dvin_index[device_inode]
-                finfo = self.file_info[index]
+                finfo = self._live(index)
             else:
                 raise ValueError("Either index or path must be provided.")
             
-            # Remove item from all indexes
             self._dirty = True
-            self.file_info.pop(index)
-            self.path_index.pop(finfo.path)
-            self.hash_index.remove(finfo.file_hash, index)
-            self.f16b_index.remove(finfo.first_16b, index)
-            self.dvin_index.pop((finfo.device, finfo.inode))
-            return finfo
+            self._log_change('-', str(finfo.path))
+            return self._pop_item(index)
+
+    def _pop_item(self, index: int) -> FileInfo:
+        # Remove item from all indexes. Assumes the index exists.
+        finfo = self._live(index)
+        self.file_info[index] = None
+        self._removed += 1
+        self.path_index.pop(finfo.path)
+        self.hash_index.remove(finfo.file_hash, index)
+        self.f16b_index.remove(finfo.first_16b, index)
+        self.dvin_index.pop((finfo.device, finfo.inode))
+        return finfo
+
+    def pop_items(self, *, paths: Iterable[Path]) -> list[FileInfo]:
+        # Remove all items with the given paths under a single lock acquisition.
+        # Paths that are not in the database are ignored.
+        with self._lock:
+            popped: list[FileInfo] = []
+            for path in paths:
+                index = self.path_index.get(path)
+                if index is not None:
+                    self._log_change('-', str(path))
+                    popped.append(self._pop_item(index))
+            if popped:
+                self._dirty = True
+            return popped
     
+    def _live(self, index: int) -> FileInfo:
+        # For indexes taken from the other indexes, which only point to live items
+        finfo = self.file_info[index]
+        assert finfo is not None
+        return finfo
+
+    def _info_at(self, index: int) -> FileInfo:
+        # Checks an index given by the caller. Raises KeyError if there is no item,
+        # as the dict used before did: negative indexes must not wrap around.
+        if 0 <= index < len(self.file_info):
+            finfo = self.file_info[index]
+            if finfo is not None:
+                return finfo
+        raise KeyError(index)
+
     @overload
     def _get_item(self, *, index: int) -> tuple[int, FileInfo]: ...
     @overload
@@ -267,13 +477,13 @@ class StatDB():
     def _get_item(self, *, index: int | ellipsis = ..., path: Path | ellipsis = ..., device_inode: tuple[int,int] | ellipsis = ...) -> tuple[int, FileInfo]:
         # Assumes either index or path is valid and exists. Raises KeyError if not.
         if index is not ...:
-            return index, self.file_info[index]
+            return index, self._info_at(index)
         elif path is not ...:
             idx = self.path_index[path]
-            return idx, self.file_info[idx]
+            return idx, self._live(idx)
         elif device_inode is not ...:
             idx = self.dvin_index[device_inode]
-            return idx, self.file_info[idx]
+            return idx, self._live(idx)
         else:
             raise ValueError("Either index, path or device/inode must be provided.")
     
@@ -313,6 +523,23 @@ class StatDB():
             except KeyError:
                 return None
     
+    def lookup_path_and_dvin(self, path: Path, device_inode: tuple[int,int]) -> tuple[tuple[int, FileInfo] | None, tuple[int, FileInfo] | None]:
+        # Same as get_item(path=..., return_index=True) and get_item(device_inode=..., return_index=True),
+        # but both lookups are done under a single lock acquisition.
+        with self._lock:
+            path_idx = self.path_index.get(path)
+            dvin_idx = self.dvin_index.get(device_inode)
+            return (
+                (path_idx, self._live(path_idx)) if path_idx is not None else None,
+                (dvin_idx, self._live(dvin_idx)) if dvin_idx is not None else None,
+            )
+
+    def hash_groups(self) -> list[list[tuple[int, FileInfo]]]:
+        # All entries grouped by hash, as (index, FileInfo) pairs, read under a single lock acquisition.
+        with self._lock:
+            live = self._live
+            return [[(idx, live(idx)) for idx in idxs] for _, idxs in self.hash_index.groups()]
+
     def get_items(self, *, index: int|ellipsis = ..., path: Path|ellipsis = ..., file_hash: str|ellipsis = ..., first_16b: str|ellipsis = ...) -> list[FileInfo]:
         with self._lock:
             if index is not ...:
@@ -329,42 +556,55 @@ class StatDB():
                     return []
             elif file_hash is not ...:
                 if file_hash in self.hash_index:
-                    return [self.file_info[idx] for idx in self.hash_index[file_hash]]
+                    return [self._live(idx) for idx in self.hash_index[file_hash]]
                 else:
                     return []
             elif first_16b is not ...:
                 if first_16b in self.f16b_index:
-                    return [self.file_info[idx] for idx in self.f16b_index[first_16b]]
+                    return [self._live(idx) for idx in self.f16b_index[first_16b]]
                 else:
                     return []
             else:
                 raise ValueError("One of index, path, file_hash, or first_16b must be provided.")
 
     def update_item(self, info: FileInfo, index:int|None=None) -> int:
+        # Without index, the item is found by path. With index, the item may also
+        # be given a new path, for files that were moved or renamed.
         with self._lock:
-            if info.path not in self.path_index:
-                raise ItemNotFoundError(f"Item with path {info.path} not found.")
             # if info.file_hash is None or info.first_16b is None:
             #     raise InvalidItemError("FileInfo must have file_hash and first_16b computed.")
-            
-            self._dirty = True
 
             if index is None:
+                if info.path not in self.path_index:
+                    raise ItemNotFoundError(f"Item with path {info.path} not found.")
                 idx = self.path_index[info.path]
-                old_info = self.file_info[idx]
+                old_info = self._live(idx)
             else:
-                if index not in self.file_info:
-                    raise ItemNotFoundError(f"Item with index {index} not found.")
+                try:
+                    old_info = self._info_at(index)
+                except KeyError:
+                    raise ItemNotFoundError(f"Item with index {index} not found.") from None
                 idx = index
-                old_info = self.file_info[idx]
-                if old_info.path != info.path:
-                    raise InvalidItemError("Cannot change path of existing item.")
+                if old_info.path != info.path and info.path in self.path_index:
+                    raise ItemExistsError(f"Item with path {info.path} already exists.")
+
+            self._dirty = True
 
             # Remove old indexes
             self.hash_index.remove(old_info.file_hash, idx)
             self.f16b_index.remove(old_info.first_16b, idx)
 
+            if old_info.path != info.path:
+                # The journal records a move as the removal of the old path
+                self._log_change('-', str(old_info.path))
+                del self.path_index[old_info.path]
+                self.path_index[info.path] = idx
+            if (old_info.device, old_info.inode) != (info.device, info.inode):
+                del self.dvin_index[old_info.device, old_info.inode]
+                self.dvin_index[info.device, info.inode] = idx
+
             # Update info
+            self._log_change('+', _ser_fileinfo(info))
             self.file_info[idx] = info
 
             # Add new indexes
@@ -375,4 +615,4 @@ class StatDB():
 
     def __len__(self) -> int:
         with self._lock:
-            return len(self.file_info)
\ No newline at end of file
+            return len(self.file_info) - self._removed
\ No newline at end of file
@@ -1,4 +1,6 @@
-from typing import Iterable, Iterator, TypeVar, Self, overload
+from collections.abc import MutableSet
+from contextlib import AbstractContextManager
+from typing import Any, Iterable, Iterator, TypeVar, Self, overload
 from threading import Lock as TLock
 from multiprocessing import Lock as MLock
 
@@ -28,52 +30,60 @@ class ThreadSafeIterator(Iterator[_T]):
         with self._lock:
             return next(self.iterable)
 
-class ThreadSafeSet(set[_T]):
-    @overload
-    def __init__(self, /) -> None:...
-    @overload
-    def __init__(self, iterable: Iterable[_T], /) -> None:...
-    def __init__(self, iterable: Iterable[_T] = (), /) -> None:
-        super().__init__(iterable)
-        self._lock = TLock()
+class _LockedSet(MutableSet[_T]):
+    # Wraps a set instead of subclassing it, so that no set operation can
+    # bypass the lock. The other set operations (|, &, ==, ...) come from
+    # MutableSet and go through the methods below.
+    def __init__(self, iterable: Iterable[_T], lock: AbstractContextManager[Any]) -> None:
+        self._set: set[_T] = set(iterable)
+        self._lock = lock
 
     def add(self, item: _T) -> None:
         with self._lock:
-            super().add(item)
+            self._set.add(item)
 
     def remove(self, item: _T) -> None:
         with self._lock:
-            super().remove(item)
+            self._set.remove(item)
 
     def discard(self, item: _T) -> None:
         with self._lock:
-            super().discard(item)
+            self._set.discard(item)
 
-    def __contains__(self, item: object) -> bool:
+    def update(self, items: Iterable[_T]) -> None:
+        # Adds all items with a single lock acquisition
         with self._lock:
-            return super().__contains__(item)
-
-class MultiprocessSafeSet(set[_T]):
-    @overload
-    def __init__(self, /) -> None:...
-    @overload
-    def __init__(self, iterable: Iterable[_T], /) -> None:...
-    def __init__(self, iterable: Iterable[_T] = (), /) -> None:
-        super().__init__(iterable)
-        self._lock = MLock()
+            self._set.update(items)
 
-    def add(self, item: _T) -> None:
+    def __contains__(self, item: object) -> bool:
         with self._lock:
-            super().add(item)
+            return item in self._set
 
-    def remove(self, item: _T) -> None:
+    def __iter__(self) -> Iterator[_T]:
+        # Iterates over a snapshot, so that other threads can modify the set meanwhile
         with self._lock:
-            super().remove(item)
+            return iter(list(self._set))
 
-    def discard(self, item: _T) -> None:
+    def __len__(self) -> int:
         with self._lock:
-            super().discard(item)
+            return len(self._set)
 
-    def __contains__(self, item: object) -> bool:
+    def __repr__(self) -> str:
         with self._lock:
-            return super().__contains__(item)
+            return f"{type(self).__name__}({self._set!r})"
+
+class ThreadSafeSet(_LockedSet[_T]):
+    @overload
+    def __init__(self, /) -> None:...
+    @overload
+    def __init__(self, iterable: Iterable[_T], /) -> None:...
+    def __init__(self, iterable: Iterable[_T] = (), /) -> None:
+        super().__init__(iterable, TLock())
+
+class MultiprocessSafeSet(_LockedSet[_T]):
+    @overload
+    def __init__(self, /) -> None:...
+    @overload
+    def __init__(self, iterable: Iterable[_T], /) -> None:...
+    def __init__(self, iterable: Iterable[_T] = (), /) -> None:
+        super().__init__(iterable, MLock())